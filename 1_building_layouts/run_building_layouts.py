@@ -1,34 +1,41 @@
+import os
+
 from geometry_processing import load_pickle, create_line_segments_from_polygons
 from visualisation import plot_doorways_and_rooms, plot_clinic_network
 from graph_generation import create_building_network
 from graph_simplification import run_trim_sequence, final_graph_processing, save_graph
 
 
-def main():
-    # Load data: polygons of rooms, and doorway coordinates/metadata
-    polygon_dict = load_pickle("room_polygons.pickle")
-    building_doorway_dict = load_pickle("building_doorways.pickle")
+def main(polygon_filename="room_polygons.pickle", doorway_filename="building_doorways.pickle", output_prefix=None):
+    # Load data: polygons of rooms, and doorway coordinates/metadata. A synthetic building from
+    # run_synthetic_building.py can be processed by passing its filenames. Outputs of any building other than the
+    # bundled one are prefixed with its polygon filename, so the bundled network used by apps 2 and 3 is kept.
+    if output_prefix is None and polygon_filename != "room_polygons.pickle":
+        output_prefix = f"{os.path.splitext(polygon_filename)[0]}_"
+    output_prefix = output_prefix or ""
+    polygon_dict = load_pickle(polygon_filename)
+    building_doorway_dict = load_pickle(doorway_filename)
     doorway_location_dict = building_doorway_dict['doorway_location_dict']
     doorway_connection_dict = building_doorway_dict['doorway_info_dict']
 
     # Plot input data: doorways and polygons
-    plot_doorways_and_rooms(polygon_dict, doorway_location_dict)
+    plot_doorways_and_rooms(polygon_dict, doorway_location_dict, output_prefix)
 
     # Create straight skeletons of room polygons and cut/connect them through doorways
-    updated_room_segment_dict, connecting_segment_dict = create_line_segments_from_polygons(polygon_dict, doorway_location_dict, doorway_connection_dict, plot_bool=True)
+    updated_room_segment_dict, connecting_segment_dict = create_line_segments_from_polygons(polygon_dict, doorway_location_dict, doorway_connection_dict, plot_bool=True, output_prefix=output_prefix)
 
     # Create network from line segments
     complex_G = create_building_network(updated_room_segment_dict, connecting_segment_dict)
-    plot_clinic_network(complex_G, polygon_dict, True, 'output_4_complex')
+    plot_clinic_network(complex_G, polygon_dict, True, f"{output_prefix}output_4_complex")
 
     # Simplify network using a three-stage routine
-    simplified_G = run_trim_sequence(complex_G, polygon_dict, plot_bool=True)
+    simplified_G = run_trim_sequence(complex_G, polygon_dict, plot_bool=True, output_prefix=output_prefix)
 
     # Relabel and set final edge weights of graph to Euclidean distances
     final_G = final_graph_processing(simplified_G)
 
     # Save final simplified and relabelled network
-    save_graph(final_G, "output_7_final_building_network.pickle")
+    save_graph(final_G, f"{output_prefix}output_7_final_building_network.pickle")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+from synthetic_building import create_synthetic_building, save_synthetic_building
+
+
+def main():
+    rseed = 40
+
+    # Define building: how many rooms (excluding corridors)?
+    number_of_rooms = 200
+
+    # Generate a floor plan of corridors, rooms and doorways, in the same format as the input data
+    polygon_dict, doorway_location_dict, doorway_info_dict = create_synthetic_building(number_of_rooms, seed=rseed)
+    number_of_corridors = len(polygon_dict) - number_of_rooms
+    print(f"Generated building: {number_of_rooms} rooms, {number_of_corridors} corridors, "
+          f"{len(doorway_location_dict)} doorways")
+
+    # Save next to the input data. Pass these filenames to run_building_layouts.main() to process the building.
+    save_synthetic_building(polygon_dict, doorway_location_dict, doorway_info_dict,
+                            f"synthetic_room_polygons_{number_of_rooms}.pickle",
+                            f"synthetic_building_doorways_{number_of_rooms}.pickle")
+
+
+if __name__ == "__main__":
+    main()
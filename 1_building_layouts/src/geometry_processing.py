@@ -232,7 +232,8 @@ def _find_doorway_intersections(room_segment_dict, doorway_dict, doorway_info_di
     return room_segment_dict, connecting_segment_dict
 
 
-def create_line_segments_from_polygons(polygon_dict, doorway_location_dict, doorway_connection_dict, plot_bool):
+def create_line_segments_from_polygons(polygon_dict, doorway_location_dict, doorway_connection_dict, plot_bool,
+                                       output_prefix=""):
     """Function that runs the whole geometry processing routine, and controls plotting/visualisations.
 
     Args:
@@ -240,6 +241,7 @@ def create_line_segments_from_polygons(polygon_dict, doorway_location_dict, door
         doorway_location_dict (dict): dictionary containing coordinate information of doorways
         doorway_connection_dict (dict): dictionary containing metadata about each doorway
         plot_bool (bool): if True, plots a visualisation of line segments
+        output_prefix (str): prefix of the output filenames, so different buildings do not overwrite each other
 
     Returns:
         room_segment_dict (dict): updated room segment lists in a dictionary
@@ -248,7 +250,7 @@ def create_line_segments_from_polygons(polygon_dict, doorway_location_dict, door
 
     skeleton_dict = _create_clinic_skeletons(polygon_dict)
     if plot_bool:
-        _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_location_dict)
+        _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_location_dict, output_prefix)
 
     room_segment_dict = _create_skeleton_line_dict(skeleton_dict)
     updated_room_segment_dict, connecting_segment_dict = _find_doorway_intersections(room_segment_dict,
@@ -259,6 +261,7 @@ def create_line_segments_from_polygons(polygon_dict, doorway_location_dict, door
         _plot_building_line_segments(updated_room_segment_dict,
                                      connecting_segment_dict,
                                      polygon_dict,
-                                     doorway_location_dict)
+                                     doorway_location_dict,
+                                     output_prefix)
 
     return updated_room_segment_dict, connecting_segment_dict
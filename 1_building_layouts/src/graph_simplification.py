@@ -191,7 +191,7 @@ def _relabel_graph(G):
     return G
 
 
-def run_trim_sequence(G, polygon_dict, plot_bool):
+def run_trim_sequence(G, polygon_dict, plot_bool, output_prefix=""):
     """Runs the three stage trim sequence:
         * Stage 1 - removes order 1 geometry from graph
         * Stage 2 - removes order 1 geometry that is within a threshold distance to its nearest neighbour.
@@ -204,6 +204,7 @@ def run_trim_sequence(G, polygon_dict, plot_bool):
         G (networkx graph object): graph of building
         polygon_dict (dict): dictionary containing room polygons
         plot_bool (bool): if True plots visualisations of each stage
+        output_prefix (str): prefix of the output filenames, so different buildings do not overwrite each other
 
     Returns:
         contracted_G (networkx graph object): simplified graph of building with trim sequence performed
@@ -213,7 +214,7 @@ def run_trim_sequence(G, polygon_dict, plot_bool):
     trimmed_G, nodes_removed = _trim_graph(G)
     print(f"Stage 1 - remove order 1 nodes (with no distance criteria): {nodes_removed} nodes removed")
     if plot_bool:
-        plot_clinic_network(trimmed_G, polygon_dict, True, 'output_5_trimmed')
+        plot_clinic_network(trimmed_G, polygon_dict, True, f"{output_prefix}output_5_trimmed")
 
     # Stage 2
     number_nodes_removed = 1
@@ -228,7 +229,7 @@ def run_trim_sequence(G, polygon_dict, plot_bool):
     print(f"Stage 3 - contract close node pairs in network: {number_nodes_contracted} node pairs contracted")
 
     if plot_bool:
-        plot_clinic_network(contracted_G, polygon_dict, True, 'output_6_image_of_final')
+        plot_clinic_network(contracted_G, polygon_dict, True, f"{output_prefix}output_6_image_of_final")
 
     return contracted_G
 
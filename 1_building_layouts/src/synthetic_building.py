@@ -0,0 +1,250 @@
+import pickle
+import os
+import numpy as np
+from shapely.geometry import Polygon
+from shapely.geometry.polygon import orient
+
+
+def _create_rectangle(x_min, y_min, x_max, y_max):
+    """Creates the coordinates of a rectangle, anticlockwise from the bottom left corner.
+
+    Args:
+        x_min (float): left edge of rectangle
+        y_min (float): bottom edge of rectangle
+        x_max (float): right edge of rectangle
+        y_max (float): top edge of rectangle
+
+    Returns:
+        coords (list): list of x, y coordinate tuples
+    """
+
+    return [(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]
+
+
+def _create_polygon(exterior_coords, interior_coords=None):
+    """Creates a Shapely polygon, oriented like the rooms of the input data: exterior anticlockwise, hole clockwise.
+
+    Args:
+        exterior_coords (list): x, y coordinate tuples of the outline
+        interior_coords (list): x, y coordinate tuples of a hole (optional)
+
+    Returns:
+        polygon (Shapely polygon): room polygon
+    """
+
+    holes = [interior_coords] if interior_coords is not None else None
+
+    return orient(Polygon(exterior_coords, holes), sign=1.0)
+
+
+def _create_doorway(centre, wall_position, doorway_width, horizontal_wall):
+    """Creates the coordinates of a doorway on a horizontal or vertical wall.
+
+    Args:
+        centre (float): position of the doorway midpoint along the wall
+        wall_position (float): y position of a horizontal wall, or x position of a vertical wall
+        doorway_width (float): width of doorway
+        horizontal_wall (bool): if True the wall is horizontal, otherwise vertical
+
+    Returns:
+        doorway_coords (list): two x, y coordinate tuples, one for each end of the doorway
+    """
+
+    start, end = round(centre - doorway_width / 2, 2), round(centre + doorway_width / 2, 2)
+    if horizontal_wall:
+        return [(start, wall_position), (end, wall_position)]
+
+    return [(wall_position, start), (wall_position, end)]
+
+
+def _split_length(start, length, number_of_rooms, rng):
+    """Splits a wall into rooms of random widths, rounded to 0.1 m, that exactly fill it.
+
+    Args:
+        start (float): position of the start of the wall
+        length (float): length of the wall
+        number_of_rooms (int): number of rooms along the wall
+        rng (numpy Generator): random number generator
+
+    Returns:
+        boundaries (list): positions of the room walls along the wall, from start to end
+    """
+
+    widths = rng.uniform(1, 1.6, number_of_rooms)
+    boundaries = start + np.concatenate([[0], np.cumsum(widths)]) / widths.sum() * length
+
+    return np.round(boundaries, 1).tolist()
+
+
+def _random_doorway_centre(room_start, room_end, doorway_width, rng):
+    """Chooses a random doorway midpoint along a room wall, keeping the doorway clear of the corners.
+
+    Args:
+        room_start (float): position of the start of the room wall
+        room_end (float): position of the end of the room wall
+        doorway_width (float): width of doorway
+        rng (numpy Generator): random number generator
+
+    Returns:
+        centre (float): position of the doorway midpoint, rounded to 0.05 m
+    """
+
+    margin = doorway_width / 2 + 0.5
+
+    return round(rng.uniform(room_start + margin, room_end - margin) * 20) / 20
+
+
+def _add_row_of_rooms(building, boundaries, y_min, y_max, doorway_y, corridor_name, l_shaped_number, rng):
+    """Adds a row of rooms along a corridor wall to the building, each with a doorway into the corridor. Some rooms
+    are L-shaped: a small room is cut out of the corner furthest from the corridor, with its own doorway into the
+    L-shaped room.
+
+    Args:
+        building (dict): polygon_dict, doorway_location_dict and doorway_info_dict of the building, the doorway width,
+        and the number of corridors and rooms so far
+        boundaries (list): x positions of the room walls along the row
+        y_min (float): bottom edge of the row
+        y_max (float): top edge of the row
+        doorway_y (float): y position of the corridor wall, either y_min or y_max
+        corridor_name (str): name of the corridor the row of rooms opens onto
+        l_shaped_number (int): number of rooms in the row that are L-shaped
+        rng (numpy Generator): random number generator
+
+    Returns:
+        None
+    """
+
+    doorway_width = building['doorway_width']
+    l_shaped_idxs = rng.choice(len(boundaries) - 1, l_shaped_number, replace=False)
+    for idx, (x_min, x_max) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        building['number_of_rooms'] += 1
+        room_name = f"room {building['number_of_rooms']}"
+        room_coords = _create_rectangle(x_min, y_min, x_max, y_max)
+
+        if idx in l_shaped_idxs:
+            # The cut-out room sits in the far corner from the corridor, and opens onto the L-shaped room
+            cut_width = round(max((x_max - x_min) * rng.uniform(0.4, 0.5), doorway_width + 1), 1)
+            cut_depth = round((y_max - y_min) * rng.uniform(0.4, 0.5), 1)
+            cut_x = round(x_max - cut_width, 1)
+            far_y = y_max if doorway_y == y_min else y_min
+            inner_y = round(far_y - cut_depth, 1) if far_y == y_max else round(far_y + cut_depth, 1)
+            room_coords = [(x_min, doorway_y), (x_max, doorway_y), (x_max, inner_y), (cut_x, inner_y), (cut_x, far_y),
+                           (x_min, far_y)]
+
+            building['number_of_rooms'] += 1
+            cut_room_name = f"room {building['number_of_rooms']}"
+            building['polygon_dict'][room_name] = _create_polygon(room_coords)
+            building['polygon_dict'][cut_room_name] = _create_polygon(
+                _create_rectangle(cut_x, min(inner_y, far_y), x_max, max(inner_y, far_y)))
+            building['doorway_location_dict'][cut_room_name] = _create_doorway(
+                _random_doorway_centre(cut_x, x_max, doorway_width, rng), inner_y, doorway_width, True)
+            building['doorway_info_dict'][cut_room_name] = room_name
+
+        else:
+            building['polygon_dict'][room_name] = _create_polygon(room_coords)
+
+        building['doorway_location_dict'][room_name] = _create_doorway(
+            _random_doorway_centre(x_min, x_max, doorway_width, rng), doorway_y, doorway_width, True)
+        building['doorway_info_dict'][room_name] = corridor_name
+
+
+def create_synthetic_building(number_of_rooms, seed=None, rooms_per_row=4, room_width=4.5, room_depth=5.0,
+                              corridor_width=2.0, doorway_width=1.5, l_shaped_fraction=0.2):
+    """Procedurally generates a floor plan of any number of rooms, in the same format as the input data of app 1, so
+    the apps can be driven by buildings of any size.
+
+    The building is a row of wings. Each wing is a ring-shaped corridor (a polygon with a hole) around an island of
+    rooms, with a row of rooms on either side of the island, and a row of rooms along the top and bottom of the ring.
+    Every room has one doorway, on the wall it shares with its corridor. Some rooms along the outside of the building
+    are L-shaped, with a small room in the cut-out corner that opens onto the L-shaped room. Each corridor after the
+    first has a doorway onto the corridor of the previous wing, on the wall they share. If the last wing has too few
+    rooms to fill its island, the rest of the island is left empty.
+
+    Args:
+        number_of_rooms (int): number of rooms in the building, excluding the corridors
+        seed (int): seed of the random number generator, so the same building is generated every time
+        rooms_per_row (int): number of rooms along each row of a full wing
+        room_width (float): mean width of the rooms along a full row, m
+        room_depth (float): depth of every room from its corridor, m
+        corridor_width (float): width of the corridors, m
+        doorway_width (float): width of every doorway, m
+        l_shaped_fraction (float): fraction of the rooms along the outside of the building that are L-shaped
+
+    Returns:
+        polygon_dict (dict): dictionary of room polygons, including the corridors
+        doorway_location_dict (dict): doorway coordinates (two points) for each room, keyed by room name
+        doorway_info_dict (dict): the room on the other side of the doorway of each room, keyed by room name
+    """
+
+    rng = np.random.default_rng(seed)
+    building = {'polygon_dict': {}, 'doorway_location_dict': {}, 'doorway_info_dict': {},
+                'doorway_width': doorway_width, 'number_of_corridors': 0, 'number_of_rooms': 0}
+
+    island_length = round(rooms_per_row * room_width, 1)
+    wing_length = round(island_length + 2 * corridor_width, 1)
+    wing_height = round(2 * room_depth + 2 * corridor_width, 1)
+
+    remaining_rooms, x_min = number_of_rooms, 0.0
+    while remaining_rooms > 0:
+        corridor_name = 'corridor' if building['number_of_corridors'] == 0 else \
+            f"corridor {building['number_of_corridors'] + 1}"
+        x_max = round(x_min + wing_length, 1)
+        island_x_min, island_x_max = round(x_min + corridor_width, 1), round(x_max - corridor_width, 1)
+        island_y_min, island_y_mid = corridor_width, round(corridor_width + room_depth, 1)
+        island_y_max = round(wing_height - corridor_width, 1)
+
+        building['polygon_dict'][corridor_name] = _create_polygon(
+            _create_rectangle(x_min, 0.0, x_max, wing_height),
+            _create_rectangle(island_x_min, island_y_min, island_x_max, island_y_max))
+        building['number_of_corridors'] += 1
+        if building['number_of_corridors'] > 1:
+            previous_corridor_name = 'corridor' if building['number_of_corridors'] == 2 else \
+                f"corridor {building['number_of_corridors'] - 1}"
+            centre = _random_doorway_centre(island_y_min, island_y_max, doorway_width, rng)
+            building['doorway_location_dict'][corridor_name] = _create_doorway(centre, x_min, doorway_width, False)
+            building['doorway_info_dict'][corridor_name] = previous_corridor_name
+
+        # Share the rooms of the wing between its four rows: outside bottom, island bottom, island top, outside top
+        wing_rooms = min(remaining_rooms, 4 * rooms_per_row)
+        row_rooms = [wing_rooms // 4 + (row_idx < wing_rooms % 4) for row_idx in range(4)]
+        rows = [(x_min, x_max, -room_depth, 0.0, 0.0, True),
+                (island_x_min, island_x_max, island_y_min, island_y_mid, island_y_min, False),
+                (island_x_min, island_x_max, island_y_mid, island_y_max, island_y_max, False),
+                (x_min, x_max, wing_height, round(wing_height + room_depth, 1), wing_height, True)]
+
+        for number_in_row, (row_x_min, row_x_max, y_min, y_max, doorway_y, outside_row) in zip(row_rooms, rows):
+            if number_in_row == 0:
+                continue
+            # An L-shaped room and its cut-out room take up the space of one room along the row
+            l_shaped_number = rng.binomial(number_in_row // 2, l_shaped_fraction) if outside_row else 0
+            boundaries = _split_length(row_x_min, row_x_max - row_x_min, number_in_row - l_shaped_number, rng)
+            _add_row_of_rooms(building, boundaries, y_min, y_max, doorway_y, corridor_name, l_shaped_number, rng)
+
+        remaining_rooms -= wing_rooms
+        x_min = x_max
+
+    return building['polygon_dict'], building['doorway_location_dict'], building['doorway_info_dict']
+
+
+def save_synthetic_building(polygon_dict, doorway_location_dict, doorway_info_dict, polygon_filename,
+                            doorway_filename):
+    """Saves a synthetic building to the input data folder, as the same pair of pickles as the input data of app 1.
+
+    Args:
+        polygon_dict (dict): dictionary of room polygons
+        doorway_location_dict (dict): doorway coordinates (two points) for each room
+        doorway_info_dict (dict): the room on the other side of the doorway of each room
+        polygon_filename (str): filename of the room polygons pickle
+        doorway_filename (str): filename of the doorways pickle
+
+    Returns:
+        None
+    """
+
+    resource_dir = "data/"
+    with open(os.path.join(resource_dir, polygon_filename), 'wb') as handle:
+        pickle.dump(polygon_dict, handle)
+
+    building_doorway_dict = {'doorway_info_dict': doorway_info_dict, 'doorway_location_dict': doorway_location_dict}
+    with open(os.path.join(resource_dir, doorway_filename), 'wb') as handle:
+        pickle.dump(building_doorway_dict, handle)
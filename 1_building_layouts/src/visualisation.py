@@ -4,13 +4,14 @@ import numpy as np
 import networkx as nx
 
 
-def plot_doorways_and_rooms(polygon_dict, doorway_dict):
+def plot_doorways_and_rooms(polygon_dict, doorway_dict, output_prefix=""):
     """Plots the input data, i.e. the building polygons of rooms, and the staircase information (in red). An output
     figure is saved, and a figure is printed to console.
 
     Args:
         polygon_dict (dict): dictionary of polygons for each room
         doorway_dict (dict): contains doorway coordinate information
+        output_prefix (str): prefix of the output filenames, so different buildings do not overwrite each other
 
     Returns:
         None
@@ -45,11 +46,11 @@ def plot_doorways_and_rooms(polygon_dict, doorway_dict):
     plt.title("Building layout: rooms and doorways")
     plt.xlabel('x position, m')
     plt.ylabel('y position, m')
-    plt.savefig('output/output_1_building_and_doorways.png')
+    plt.savefig(f"output/{output_prefix}output_1_building_and_doorways.png")
     plt.show()
 
 
-def _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_dict):
+def _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_dict, output_prefix=""):
     """Plots the straight skeletons of each room in the building. The corridor skeleton is plotted in red. As before,
     a figure is saved and also printed to console.
 
@@ -57,6 +58,7 @@ def _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_dict):
         polygon_dict (dict): dictionary of polygons for each room
         skeleton_dict (dict): dictionary of straight skeleton objects for each room
         doorway_dict (dict): contains doorway coordinate information
+        output_prefix (str): prefix of the output filenames, so different buildings do not overwrite each other
 
     Returns:
         None
@@ -71,7 +73,7 @@ def _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_dict):
 
         skeleton = skeleton_dict[room_name]
 
-        if room_name == 'corridor':
+        if room_name.startswith('corridor'):
             color_style_string = 'r-'
 
         else:
@@ -83,7 +85,7 @@ def _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_dict):
                 p2 = h.opposite.vertex.point
                 ax.plot([p1.x(), p2.x()], [p1.y(), p2.y()], color_style_string, lw=2)
 
-        if room_name != 'corridor':
+        if room_name in doorway_dict:
             doorway_coords = doorway_dict[room_name]
 
             ax.plot([i[0] for i in doorway_coords],
@@ -95,11 +97,12 @@ def _plot_building_skeletons(polygon_dict, skeleton_dict, doorway_dict):
 
     ax.axis('equal')
     plt.title("Straight skeletons of each room in building")
-    plt.savefig('output/output_2_straight_skeletons_of_rooms.png')
+    plt.savefig(f"output/{output_prefix}output_2_straight_skeletons_of_rooms.png")
     plt.show()
 
 
-def _plot_building_line_segments(updated_room_segment_dict, connecting_segment_dict, polygon_dict, doorway_dict):
+def _plot_building_line_segments(updated_room_segment_dict, connecting_segment_dict, polygon_dict, doorway_dict,
+                                 output_prefix=""):
     """Plots the cut line segments for each room, and the connecting intersection segments in red, all on the building
     floor plan. The multi-colours are used to indicate the cut points of each line segment.
 
@@ -108,6 +111,7 @@ def _plot_building_line_segments(updated_room_segment_dict, connecting_segment_d
         connecting_segment_dict (dict): dictionary of the connecting segments
         polygon_dict (dict): dictionary of polygons for each room
         doorway_dict (dict): contains doorway coordinate information
+        output_prefix (str): prefix of the output filenames, so different buildings do not overwrite each other
 
     Returns:
         None
@@ -153,7 +157,7 @@ def _plot_building_line_segments(updated_room_segment_dict, connecting_segment_d
     plt.title("Straight skeletons of rooms cut into line segments")
     plt.xlabel('x position, m')
     plt.ylabel('y position, m')
-    plt.savefig('output/output_3_line_segments.png')
+    plt.savefig(f"output/{output_prefix}output_3_line_segments.png")
     plt.show()
 
 
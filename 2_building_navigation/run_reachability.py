@@ -0,0 +1,31 @@
+import random
+import time
+
+from navigation import load_pickle
+
+from reachability import find_rooms_within_distance, find_rooms_covered
+
+
+def main():
+    # Load data: building graph
+    building_G = load_pickle('final_building_network.pickle')
+
+    # Which rooms are within a given distance of a single node?
+    cutoff = 15
+    source = random.choice(list(building_G.nodes))
+    node_distances, room_distances = find_rooms_within_distance(building_G, source, cutoff)
+    print(f"{len(node_distances)} nodes in {len(room_distances)} rooms are within {cutoff} m of {source}:")
+    for room, distance in sorted(room_distances.items(), key=lambda item: item[1]):
+        print(f"    {room}: {distance:.2f} m")
+
+    # Which rooms are covered by a set of staff positions? This is cheap enough to recompute every second.
+    staff_positions = random.sample(list(building_G.nodes), 3)
+    start = time.perf_counter()
+    room_distances, uncovered_rooms = find_rooms_covered(building_G, staff_positions, cutoff)
+    elapsed = time.perf_counter() - start
+    print(f"Staff at {staff_positions} cover {len(room_distances)} rooms within {cutoff} m ({1000 * elapsed:.2f} ms)")
+    print(f"Rooms not covered: {uncovered_rooms}")
+
+
+if __name__ == "__main__":
+    main()
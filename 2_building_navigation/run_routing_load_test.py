@@ -0,0 +1,26 @@
+import asyncio
+
+from navigation import load_pickle
+
+from query_workload import create_room_buckets, generate_query_pairs
+from load_generator import run_load_test, print_load_test_results
+
+
+def main():
+    # Load the building graph, used only to pick valid node pairs to request
+    building_G = load_pickle('final_building_network.pickle')
+
+    # Draw a seeded, reproducible batch of node pairs from different rooms
+    number_of_requests = 5000
+    room_buckets = create_room_buckets(building_G)
+    sources, targets = generate_query_pairs(room_buckets, number_of_requests, distribution='uniform', seed=40)
+    node_pairs = list(zip(sources.tolist(), targets.tolist()))
+
+    # Send the requests to a running routing service (see run_routing_service.py) and report latency/throughput
+    concurrency = 32
+    results = asyncio.run(run_load_test('127.0.0.1', 8765, node_pairs, concurrency))
+    print_load_test_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import asyncio
+
+from navigation import load_pickle
+
+from routing_service import RoutingService
+
+
+def main():
+    # Load the building graph once, it is shared with every worker when the service starts
+    building_G = load_pickle('final_building_network.pickle')
+
+    # Serve route requests on localhost until interrupted
+    routing_service = RoutingService(building_G, host='127.0.0.1', port=8765, n_workers=4)
+    try:
+        asyncio.run(routing_service.serve_forever())
+    except KeyboardInterrupt:
+        print(f"Routing service stopped after serving {routing_service.requests_served} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+import numpy as np
+
+
+async def _run_client(host, port, node_pairs, latencies, errors):
+    """Runs a single client connection, sending one route request at a time and recording the latency of each.
+
+    Args:
+        host (str): host address of the routing service
+        port (int): port of the routing service
+        node_pairs (list): list of (source, target) node pairs to request
+        latencies (list): list that request latencies (in seconds) are appended to
+        errors (list): list that error messages are appended to
+
+    Returns:
+        None
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request_id, (source, target) in enumerate(node_pairs):
+            request = {'id': request_id, 'source': source, 'target': target}
+            start = time.perf_counter()
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if 'error' in response:
+                errors.append(response['error'])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(host, port, node_pairs, concurrency):
+    """Sends the given route requests to a routing service over a number of concurrent connections, and measures the
+    latency of every request and the overall throughput.
+
+    Args:
+        host (str): host address of the routing service
+        port (int): port of the routing service
+        node_pairs (list): list of (source, target) node pairs to request
+        concurrency (int): number of concurrent client connections
+
+    Returns:
+        results (dict): number of requests and errors, p50/p99 latency in ms, and throughput in requests per second
+    """
+
+    latencies, errors = [], []
+    client_pairs = [node_pairs[i::concurrency] for i in range(concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*[_run_client(host, port, pairs, latencies, errors) for pairs in client_pairs if pairs])
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = 1000 * np.array(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'throughput_rps': len(latencies) / elapsed,
+    }
+
+
+def print_load_test_results(results):
+    """Prints the results of a load test to console.
+
+    Args:
+        results (dict): results returned by run_load_test
+
+    Returns:
+        None
+    """
+
+    print(f"Requests: {results['requests']} ({results['errors']} errors)")
+    print(f"Latency p50: {results['p50_ms']:.2f} ms, p99: {results['p99_ms']:.2f} ms")
+    print(f"Throughput: {results['throughput_rps']:.1f} requests/s")
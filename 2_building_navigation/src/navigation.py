@@ -45,7 +45,8 @@ def select_two_random_nodes(G):
 
 def find_shortest_path(G, node_1, node_2):
     """Finds the shortest path between two given nodes in a graph. Distance is used as a heuristic, but we have
-    set the Euclidean distance between nodes to the edge weight for ease.
+    set the Euclidean distance between nodes to the edge weight for ease. A single Dijkstra search returns both the
+    path and its length.
 
     Args:
         G (networkx graph object): graph of building
@@ -57,7 +58,6 @@ def find_shortest_path(G, node_1, node_2):
         shortest_path_length (float): distance travelled along shortest path
     """
 
-    shortest_path = nx.shortest_path(G, source=node_1, target=node_2, weight='weight')
-    shortest_path_length = nx.shortest_path_length(G, source=node_1, target=node_2, weight='weight')
+    shortest_path_length, shortest_path = nx.single_source_dijkstra(G, source=node_1, target=node_2, weight='weight')
 
     return shortest_path, shortest_path_length
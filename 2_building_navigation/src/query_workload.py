@@ -0,0 +1,183 @@
+import numpy as np
+
+
+def create_room_buckets(G):
+    """Groups the nodes of a graph by parent room, so that random queries can be drawn without scanning the graph. Node
+    names are stored in one array, ordered by room, with the offset and size of each room's block of nodes.
+
+    Args:
+        G (networkx graph object): graph of building
+
+    Returns:
+        room_buckets (dict): dictionary containing the room names, the node names ordered by room, and the offset and
+        number of nodes of each room in the node array
+    """
+
+    room_nodes = {}
+    for node, data in G.nodes(data=True):
+        room_nodes.setdefault(data['parent_room'], []).append(node)
+
+    room_names = list(room_nodes.keys())
+    room_sizes = np.array([len(room_nodes[room]) for room in room_names])
+    room_offsets = np.concatenate([[0], np.cumsum(room_sizes)[:-1]])
+    node_names = np.array([node for room in room_names for node in room_nodes[room]])
+
+    return {
+        'room_names': room_names,
+        'node_names': node_names,
+        'room_offsets': room_offsets,
+        'room_sizes': room_sizes,
+    }
+
+
+def _draw_rooms(rng, room_probabilities, size):
+    """Draws room indexes from a probability distribution over rooms.
+
+    Args:
+        rng (numpy Generator): random number generator
+        room_probabilities (numpy ndarray): probability of drawing each room
+        size (int): number of rooms to draw
+
+    Returns:
+        rooms (numpy ndarray): array of room indexes
+    """
+
+    cumulative = np.cumsum(room_probabilities)
+    rooms = np.searchsorted(cumulative, rng.random(size) * cumulative[-1], side='right')
+
+    return np.minimum(rooms, len(room_probabilities) - 1)
+
+
+def _draw_other_rooms(rng, room_probabilities, source_rooms):
+    """Draws one room per source room, from a probability distribution over rooms conditioned on being a different room
+    to the source. A uniform number is drawn over the probability mass that remains once the source room is excluded,
+    and is shifted past the source room's interval, so no rejection sampling is needed.
+
+    Args:
+        rng (numpy Generator): random number generator
+        room_probabilities (numpy ndarray): probability of drawing each room
+        source_rooms (numpy ndarray): array of source room indexes
+
+    Returns:
+        rooms (numpy ndarray): array of room indexes, each different to the corresponding source room
+    """
+
+    cumulative = np.cumsum(room_probabilities)
+    source_mass = room_probabilities[source_rooms]
+    source_start = cumulative[source_rooms] - source_mass
+    remaining_mass = cumulative[-1] - source_mass
+    if np.any(remaining_mass <= 0):
+        raise ValueError("Every source room needs a different room with a non-zero probability")
+
+    draws = rng.random(len(source_rooms)) * remaining_mass
+    draws = np.where(draws >= source_start, draws + source_mass, draws)
+    rooms = np.searchsorted(cumulative, draws, side='right')
+    rooms = np.minimum(rooms, len(room_probabilities) - 1)
+
+    # Guard against floating point edge cases landing on the source room or on an empty room
+    clash = (rooms == source_rooms) | (room_probabilities[rooms] == 0)
+    while np.any(clash):
+        rooms[clash] = _draw_rooms(rng, room_probabilities, np.count_nonzero(clash))
+        clash = (rooms == source_rooms) | (room_probabilities[rooms] == 0)
+
+    return rooms
+
+
+def _draw_nodes_in_rooms(rng, room_buckets, rooms):
+    """Draws one node uniformly at random from each given room.
+
+    Args:
+        rng (numpy Generator): random number generator
+        room_buckets (dict): room buckets created by create_room_buckets
+        rooms (numpy ndarray): array of room indexes
+
+    Returns:
+        node_indexes (numpy ndarray): array of indexes into the node name array
+    """
+
+    return room_buckets['room_offsets'][rooms] + rng.integers(0, room_buckets['room_sizes'][rooms])
+
+
+def _get_room_probabilities(room_buckets, distribution, room_weights, hotspot_rooms, hotspot_fraction):
+    """Creates the source and target room probabilities for a query distribution:
+        * uniform - every node is equally likely, so rooms are weighted by their number of nodes
+        * room_weighted - rooms are drawn using the given room weights (equal by default), whatever their size
+        * hotspot - sources are uniform over nodes, and hotspot_fraction of targets are in the hotspot rooms
+
+    Args:
+        room_buckets (dict): room buckets created by create_room_buckets
+        distribution (str): one of 'uniform', 'room_weighted' or 'hotspot'
+        room_weights (dict): dictionary of room name: weight, used by the room_weighted distribution
+        hotspot_rooms (list): list of hotspot room names, used by the hotspot distribution. Every name must be a room
+        of the building.
+        hotspot_fraction (float): fraction of targets in a hotspot room, used by the hotspot distribution
+
+    Returns:
+        source_probabilities (numpy ndarray): probability of each room being the source room
+        target_probabilities (numpy ndarray): probability of each room being the target room
+    """
+
+    room_names = room_buckets['room_names']
+    room_sizes = room_buckets['room_sizes']
+    size_probabilities = room_sizes / room_sizes.sum()
+
+    if distribution == 'uniform':
+        return size_probabilities, size_probabilities
+
+    if distribution == 'room_weighted':
+        room_weights = room_weights or {}
+        weights = np.array([room_weights.get(room, 1.0) for room in room_names], dtype=float)
+        return weights / weights.sum(), weights / weights.sum()
+
+    if distribution == 'hotspot':
+        if not hotspot_rooms:
+            raise ValueError("The hotspot distribution requires a list of hotspot rooms")
+        unknown_rooms = sorted(set(hotspot_rooms) - set(room_names))
+        if unknown_rooms:
+            raise ValueError(f"Unknown hotspot rooms: {', '.join(unknown_rooms)}")
+
+        # If every room is a hotspot, all of the targets are hotspot rooms
+        is_hotspot = np.isin(room_names, hotspot_rooms)
+        target_probabilities = is_hotspot / is_hotspot.sum()
+        non_hotspot_probabilities = np.where(is_hotspot, 0.0, size_probabilities)
+        if non_hotspot_probabilities.sum() > 0:
+            target_probabilities = (hotspot_fraction * target_probabilities +
+                                    (1 - hotspot_fraction) * non_hotspot_probabilities / non_hotspot_probabilities.sum())
+        return size_probabilities, target_probabilities
+
+    raise ValueError(f"Unknown query distribution: {distribution}")
+
+
+def generate_query_pairs(room_buckets, number_of_pairs, distribution='uniform', seed=None, room_weights=None,
+                         hotspot_rooms=None, hotspot_fraction=0.8):
+    """Generates a batch of random (source, target) node pairs, where the two nodes are always in different rooms. All
+    draws are vectorised, and a seed (or an existing numpy Generator) makes the workload reproducible. Large workloads
+    can be generated in batches by passing the same Generator to repeated calls.
+
+    Args:
+        room_buckets (dict): room buckets created by create_room_buckets
+        number_of_pairs (int): number of query pairs to generate
+        distribution (str): one of 'uniform', 'room_weighted' or 'hotspot'
+        seed (int or numpy Generator): seed or random number generator
+        room_weights (dict): dictionary of room name: weight, used by the room_weighted distribution
+        hotspot_rooms (list): list of hotspot room names, used by the hotspot distribution. Every name must be a room
+        of the building.
+        hotspot_fraction (float): fraction of targets in a hotspot room, used by the hotspot distribution
+
+    Returns:
+        sources (numpy ndarray): array of source node names
+        targets (numpy ndarray): array of target node names, each in a different room to its source
+    """
+
+    rng = np.random.default_rng(seed)
+    source_probabilities, target_probabilities = _get_room_probabilities(room_buckets, distribution, room_weights,
+                                                                         hotspot_rooms, hotspot_fraction)
+
+    source_rooms = _draw_rooms(rng, source_probabilities, number_of_pairs)
+    target_rooms = _draw_other_rooms(rng, target_probabilities, source_rooms)
+
+    node_names = room_buckets['node_names']
+    sources = node_names[_draw_nodes_in_rooms(rng, room_buckets, source_rooms)]
+    targets = node_names[_draw_nodes_in_rooms(rng, room_buckets, target_rooms)]
+
+    return sources, targets
@@ -0,0 +1,95 @@
+import networkx as nx
+
+
+def find_nodes_within_distance(G, source, cutoff):
+    """Finds every node that can be reached from a source node within a cutoff distance (an isochrone). The Dijkstra
+    search stops expanding once the cutoff is exceeded, so only the local part of the graph is explored.
+
+    Args:
+        G (networkx graph object): graph of building
+        source (str): node name of the source node
+        cutoff (float): maximum distance travelled from the source, m
+
+    Returns:
+        node_distances (dict): dictionary of node name: shortest distance from the source, for reachable nodes
+    """
+
+    return nx.single_source_dijkstra_path_length(G, source, cutoff=cutoff, weight='weight')
+
+
+def find_nodes_within_distance_of_sources(G, sources, cutoff):
+    """Finds every node that can be reached from any of a list of source nodes within a cutoff distance. A single
+    multi-source Dijkstra search is run, rather than one search per source, and the distance recorded for each node is
+    the distance to its nearest source.
+
+    Args:
+        G (networkx graph object): graph of building
+        sources (list): list of source node names, e.g. the current positions of staff
+        cutoff (float): maximum distance travelled from the nearest source, m
+
+    Returns:
+        node_distances (dict): dictionary of node name: shortest distance from the nearest source, for reachable nodes
+    """
+
+    return nx.multi_source_dijkstra_path_length(G, set(sources), cutoff=cutoff, weight='weight')
+
+
+def aggregate_distances_by_room(G, node_distances):
+    """Aggregates node distances to room distances using the parent room attribute of each node. A room is reached as
+    soon as any one of its nodes is reached, so the minimum node distance in each room is kept.
+
+    Args:
+        G (networkx graph object): graph of building
+        node_distances (dict): dictionary of node name: distance
+
+    Returns:
+        room_distances (dict): dictionary of room name: minimum distance to any node in the room
+    """
+
+    room_distances = {}
+    for node, distance in node_distances.items():
+        parent_room = G.nodes[node]['parent_room']
+        if distance < room_distances.get(parent_room, float('inf')):
+            room_distances[parent_room] = distance
+
+    return room_distances
+
+
+def find_rooms_within_distance(G, source, cutoff):
+    """Finds every room that can be reached from a source node within a cutoff distance.
+
+    Args:
+        G (networkx graph object): graph of building
+        source (str): node name of the source node
+        cutoff (float): maximum distance travelled from the source, m
+
+    Returns:
+        node_distances (dict): dictionary of node name: shortest distance from the source, for reachable nodes
+        room_distances (dict): dictionary of room name: shortest distance from the source, for reachable rooms
+    """
+
+    node_distances = find_nodes_within_distance(G, source, cutoff)
+
+    return node_distances, aggregate_distances_by_room(G, node_distances)
+
+
+def find_rooms_covered(G, sources, cutoff):
+    """Finds which rooms are covered by a list of sources, i.e. which rooms can be reached from at least one source
+    within a cutoff distance, and which rooms cannot.
+
+    Args:
+        G (networkx graph object): graph of building
+        sources (list): list of source node names, e.g. the current positions of staff
+        cutoff (float): maximum distance travelled from the nearest source, m
+
+    Returns:
+        room_distances (dict): dictionary of room name: distance from the nearest source, for covered rooms
+        uncovered_rooms (list): list of rooms that cannot be reached within the cutoff distance
+    """
+
+    node_distances = find_nodes_within_distance_of_sources(G, sources, cutoff)
+    room_distances = aggregate_distances_by_room(G, node_distances)
+    all_rooms = dict.fromkeys(data['parent_room'] for _, data in G.nodes(data=True))
+    uncovered_rooms = [room for room in all_rooms if room not in room_distances]
+
+    return room_distances, uncovered_rooms
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+
+from navigation import find_shortest_path
+
+_worker_G = None
+
+
+def _initialise_worker(G):
+    """Stores the building graph in a module level variable of each worker process, so that the graph is transferred
+    to a worker once when the pool starts, rather than once per route request.
+
+    Args:
+        G (networkx graph object): graph of building
+
+    Returns:
+        None
+    """
+
+    global _worker_G
+    _worker_G = G
+
+
+def _route_in_worker(node_1, node_2):
+    """Finds the shortest path between two nodes using the graph held by the worker process.
+
+    Args:
+        node_1 (str): node name of start node
+        node_2 (str): node name of end node
+
+    Returns:
+        shortest_path (list): list of nodes on shortest path
+        shortest_path_length (float): distance travelled along shortest path
+    """
+
+    return find_shortest_path(_worker_G, node_1, node_2)
+
+
+def _encode_message(message):
+    """Encodes a message dictionary as a single line of JSON, the framing used by the routing service.
+
+    Args:
+        message (dict): message to send
+
+    Returns:
+        encoded message (bytes): newline terminated JSON message
+    """
+
+    return (json.dumps(message) + "\n").encode()
+
+
+class RoutingService:
+    """Asyncio routing service that answers shortest path requests over a local TCP socket. The building network is
+    loaded once, and shared with a pool of worker processes when the service starts. Route searches run in the pool,
+    so the event loop only parses requests and writes responses, and stays responsive under concurrent load.
+
+    The protocol is newline delimited JSON. Each request is a line such as
+    {"id": 1, "source": "room 1 n1", "target": "room 5 n1"}, and each response echoes the id alongside either the
+    "path" and "distance", or an "error". Requests on a single connection may be pipelined, and responses are written
+    as soon as each route is found, so clients should match responses to requests using the id.
+    """
+
+    def __init__(self, G, host='127.0.0.1', port=8765, n_workers=None):
+        """Stores the graph and the network settings. The worker pool is created when the service starts.
+
+        Args:
+            G (networkx graph object): graph of building
+            host (str): host address to bind to, local only by default
+            port (int): port to listen on, 0 selects a free port
+            n_workers (int): number of worker processes, defaults to the number of CPUs
+        """
+
+        self.G = G
+        self.host = host
+        self.port = port
+        self.n_workers = n_workers or os.cpu_count()
+        self.executor = None
+        self.server = None
+        self.requests_served = 0
+
+    async def start(self):
+        """Starts the worker pool and the TCP server. The bound port is stored, which is useful when port 0 is used.
+
+        The worker processes are started before the server, otherwise they would be started by the first request and
+        inherit the open sockets, keeping client connections open after the service closes them.
+
+        Returns:
+            None
+        """
+
+        self.executor = ProcessPoolExecutor(max_workers=self.n_workers,
+                                            initializer=_initialise_worker,
+                                            initargs=(self.G,))
+        await asyncio.get_running_loop().run_in_executor(self.executor, os.getpid)
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Routing service listening on {self.host}:{self.port} with {self.n_workers} workers")
+
+    async def serve_forever(self):
+        """Starts the service and serves requests until cancelled.
+
+        Returns:
+            None
+        """
+
+        await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Closes the server and shuts the worker pool down, without waiting for running route searches, so the event
+        loop is not blocked.
+
+        Returns:
+            None
+        """
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def _answer_request(self, request):
+        """Answers a single route request. Unknown nodes are rejected in the event loop, so no worker time is wasted
+        on them, and valid searches are offloaded to the worker pool. Any failure of the search is returned as an
+        error, so every request gets a response.
+
+        Args:
+            request (dict): decoded request containing an id, a source and a target node
+
+        Returns:
+            response (dict): response containing the path and distance, or an error
+        """
+
+        request_id = request.get('id')
+        source, target = request.get('source'), request.get('target')
+        if not isinstance(source, str) or not isinstance(target, str) or source not in self.G or target not in self.G:
+            return {'id': request_id, 'error': f"unknown node in request: {source}, {target}"}
+
+        loop = asyncio.get_running_loop()
+        try:
+            path, distance = await loop.run_in_executor(self.executor, _route_in_worker, source, target)
+        except nx.NetworkXNoPath:
+            return {'id': request_id, 'error': f"no path between {source} and {target}"}
+        except Exception as error:
+            return {'id': request_id, 'error': f"route search failed: {type(error).__name__}: {error}"}
+
+        self.requests_served += 1
+        return {'id': request_id, 'path': path, 'distance': distance}
+
+    async def _send_response(self, writer, write_lock, response):
+        """Writes a response back to the client.
+
+        Args:
+            writer (asyncio StreamWriter): stream of the client connection
+            write_lock (asyncio Lock): lock so responses to pipelined requests are not interleaved
+            response (dict): response to send
+
+        Returns:
+            None
+        """
+
+        async with write_lock:
+            writer.write(_encode_message(response))
+            await writer.drain()
+
+    async def _respond(self, writer, write_lock, line):
+        """Decodes a request line, answers it, and writes the response back to the client. A line that is not a JSON
+        object, including one that is not valid UTF-8, is answered with a malformed request error.
+
+        Args:
+            writer (asyncio StreamWriter): stream of the client connection
+            write_lock (asyncio Lock): lock so responses to pipelined requests are not interleaved
+            line (bytes): a single request line
+
+        Returns:
+            None
+        """
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            # JSONDecodeError and UnicodeDecodeError are both ValueErrors
+            request = None
+
+        if isinstance(request, dict):
+            response = await self._answer_request(request)
+        else:
+            response = {'id': None, 'error': 'malformed request'}
+
+        await self._send_response(writer, write_lock, response)
+
+    async def _handle_connection(self, reader, writer):
+        """Handles a single client connection. Every request line is answered in its own task, so a slow route does not
+        hold up the requests pipelined behind it. A line longer than the stream limit is answered with an error, and
+        the connection is closed once the requests before it are answered, as the end of that line cannot be told
+        apart from the next request. If the connection fails, the requests still being answered are cancelled.
+
+        Args:
+            reader (asyncio StreamReader): stream of incoming request lines
+            writer (asyncio StreamWriter): stream of the client connection
+
+        Returns:
+            None
+        """
+
+        write_lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Raised by readline in place of LimitOverrunError when a line is longer than the stream limit
+                    await self._send_response(writer, write_lock, {'id': None, 'error': 'request line too long'})
+                    break
+                if not line:
+                    break
+                task = asyncio.create_task(self._respond(writer, write_lock, line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            writer.close()
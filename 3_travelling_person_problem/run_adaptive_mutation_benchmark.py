@@ -0,0 +1,79 @@
+import time
+import numpy as np
+
+from ga_mappings import load_pickle, create_mapping
+from distance_matrix_cache import load_or_create_distance_matrix
+
+from genetic_algorithm import GeneticAlgorithm
+from mutation_schedule import AdaptiveMutation
+from stopping_criteria import StoppingCriteria
+
+
+def main():
+    rseeds = range(40, 60)
+
+    # Load data
+    building_G = load_pickle('final_building_network.pickle')
+    distance_matrix, room_list = load_or_create_distance_matrix(building_G)
+    map_dict = create_mapping(room_list)
+    route_length = 22
+
+    # Set up genetic algorithm parameters, shared by every configuration. Each run stops when it reaches the target.
+    max_epochs = 600
+    population_size = 200
+    elite_number = 25
+    target_distance = 440
+
+    # Fixed mutation rates against the adaptive schedule, with and without duplicate replacement
+    configurations = {
+        'fixed 0.8': lambda: {'mutation_rate': 0.8},
+        'fixed 0.01': lambda: {'mutation_rate': 0.01},
+        'fixed 0.01 + duplicates': lambda: {'mutation_rate': 0.01, 'replace_duplicates': True},
+        'adaptive': lambda: {'mutation_rate': 0.02, 'mutation_schedule': AdaptiveMutation()},
+        'adaptive + duplicates': lambda: {'mutation_rate': 0.02, 'mutation_schedule': AdaptiveMutation(),
+                                          'replace_duplicates': True},
+    }
+
+    # Epochs alone are not comparable between configurations: at or below INCREMENTAL_DISTANCE_MAX_RATE mutated routes
+    # are updated from the edges each swap changes, and above it they are evaluated in full. So the routes evaluated in
+    # full, the routes updated by swap deltas, and the wall-clock time to reach the target are reported as well, over
+    # the runs that reached it. Runs that do not reach the target count as max_epochs in the epoch columns.
+    print(f"Epochs, route evaluations, swap delta updates and time to reach {target_distance} m "
+          f"(at most {max_epochs} epochs), over {len(rseeds)} seeds")
+    print(f"{'configuration':<26}{'reached':>9}{'median epochs':>15}{'mean epochs':>13}"
+          f"{'median evals':>14}{'median deltas':>15}{'median time, s':>16}")
+    for name, create_parameters in configurations.items():
+        reached_runs, epochs_to_target, evaluations, delta_updates, run_times = [], [], [], [], []
+        for rseed in rseeds:
+            genetic_algorithm = GeneticAlgorithm(route_length,
+                                                 max_epochs,
+                                                 population_size,
+                                                 elite_number,
+                                                 map_dict=map_dict,
+                                                 seed=rseed,
+                                                 stopping_criteria=StoppingCriteria(target_distance=target_distance),
+                                                 **create_parameters())
+            start_time = time.perf_counter()
+            genetic_algorithm.run(distance_matrix, route_length, map_dict, False)
+            run_time = time.perf_counter() - start_time
+
+            reached = genetic_algorithm.history.best_distance <= target_distance
+            reached_runs.append(reached)
+            epochs_to_target.append(genetic_algorithm.epochs_run if reached else max_epochs)
+            if reached:
+                evaluations.append(genetic_algorithm.number_of_evaluations)
+                delta_updates.append(genetic_algorithm.number_of_delta_updates)
+                run_times.append(run_time)
+
+        reached_count = sum(reached_runs)
+        if reached_count:
+            reached_columns = (f"{np.median(evaluations):>14.0f}{np.median(delta_updates):>15.0f}"
+                               f"{np.median(run_times):>16.2f}")
+        else:
+            reached_columns = f"{'-':>14}{'-':>15}{'-':>16}"
+        print(f"{name:<26}{f'{reached_count}/{len(rseeds)}':>9}{np.median(epochs_to_target):>15.0f}"
+              f"{np.mean(epochs_to_target):>13.0f}{reached_columns}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from ga_mappings import load_pickle, create_mapping, reverse_room_mapping
+from distance_matrix_cache import load_or_create_distance_matrix
+
+from batched_genetic_algorithm import solve_rounds
+
+
+def main():
+    rseed = 40
+
+    # Load data
+    building_G = load_pickle('final_building_network.pickle')
+    distance_matrix, room_list = load_or_create_distance_matrix(building_G)
+    map_dict = create_mapping(room_list)
+
+    # Define problem: one round per nurse on the shift, each starting and ending at the first room, and visiting a
+    # random selection of the other rooms
+    number_of_nurses = 24
+    rooms_per_round = [8, 10, 12]
+    rng = np.random.default_rng(rseed)
+    room_idxs = np.array(list(map_dict.keys()))
+    rounds = [np.concatenate([room_idxs[:1], rng.choice(room_idxs[1:], size=rng.choice(rooms_per_round) - 1,
+                                                        replace=False)])
+              for _ in range(number_of_nurses)]
+
+    # Set up genetic algorithm parameters and run every round together
+    epochs = 500
+    population_size = 100
+    elite_number = 10
+    mutation_rate = 0.05
+
+    results = solve_rounds(distance_matrix, rounds, epochs, population_size, elite_number, mutation_rate, seed=rseed)
+
+    # Print some info to console
+    for nurse_idx, (best_route, min_distances) in enumerate(results):
+        print(f"Nurse {nurse_idx}: best distance {min(min_distances):.2f} m "
+              f"(initially {min_distances[0]:.2f} m), route: {reverse_room_mapping(best_route, map_dict)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from ga_mappings import load_pickle, create_mapping
+from distance_matrix_cache import load_or_create_distance_matrix
+
+from hyperparameter_sweep import run_sweep, summarise_sweep, print_sweep_table, save_sweep_table
+
+
+def main():
+    rseed = 40
+
+    # Load data. The distance matrix is cached to disk, and every worker memory-maps the same file.
+    building_G = load_pickle('final_building_network.pickle')
+    distance_matrix, room_list = load_or_create_distance_matrix(building_G)
+    map_dict = create_mapping(room_list)
+
+    # Define problem: how many rooms must be visited?
+    route_length = 22
+
+    # Set up the grid of genetic algorithm parameters, and the number of runs of each combination
+    parameter_grid = {
+        'epochs': [500],
+        'population_size': [100, 200],
+        'elite_number': [10, 25],
+        'mutation_rate': [0.01, 0.05, 0.2],
+    }
+    number_of_seeds = 3
+
+    results = run_sweep(distance_matrix.filename, map_dict, route_length, parameter_grid, number_of_seeds, seed=rseed)
+    summary = summarise_sweep(results, list(parameter_grid.keys()))
+
+    print_sweep_table(summary)
+    save_sweep_table(summary, "output/hyperparameter_sweep.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+
+from ga_mappings import load_pickle, create_mapping
+from distance_matrix_cache import load_or_create_distance_matrix
+
+from island_model import IslandModel
+
+
+def main():
+    rseed = 40
+
+    # Load data: the distance matrix is copied into shared memory for the islands when the model runs
+    building_G = load_pickle('final_building_network.pickle')
+    distance_matrix, room_list = load_or_create_distance_matrix(building_G)
+    map_dict = create_mapping(room_list)
+
+    # Define problem: how many rooms must be visited?
+    route_length = 22
+    print(f"The nurse must visit the following rooms once: {room_list[:route_length - 1]}")
+
+    # Set up island model parameters: one island per core, exchanging their best individuals every 50 epochs
+    number_of_islands = os.cpu_count()
+    migration_interval = 50
+    migration_size = 5
+
+    # Set up genetic algorithm parameters for each island and run
+    epochs = 2000
+    population_size = 200
+    elite_number = 25
+    mutation_rate = 0.8
+
+    island_model = IslandModel(number_of_islands,
+                               migration_interval,
+                               migration_size,
+                               epochs,
+                               population_size,
+                               elite_number,
+                               mutation_rate,
+                               seed=rseed)
+
+    island_model.run(distance_matrix, route_length, map_dict)
+    island_model.process_outputs(map_dict)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import numpy as np
+
+from ga_mappings import load_pickle, create_mapping
+from distance_matrix_cache import load_or_create_distance_matrix
+
+from genetic_algorithm import GeneticAlgorithm
+from local_search import LocalSearch
+from stopping_criteria import StoppingCriteria
+
+
+def run_timed(genetic_algorithm, distance_matrix, route_length, map_dict):
+    """Runs a genetic algorithm until its stopping criteria are met (here, a wall-clock time budget), recording the best
+    distance found so far after each epoch.
+
+    Args:
+        genetic_algorithm (GeneticAlgorithm): genetic algorithm to run
+        distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+        route_length (int): number of rooms that must be visited by the nurse/person. Sets the individual length.
+        map_dict (dict): dictionary containing room index and room name mapping
+
+    Returns:
+        elapsed_times (numpy ndarray): time at the end of each epoch, s
+        best_distances (numpy ndarray): best distance found by the end of each epoch
+    """
+
+    elapsed_times, best_distances = [], []
+    for statistics in genetic_algorithm.iterate(distance_matrix, route_length, map_dict):
+        elapsed_times.append(statistics['elapsed_time'])
+        best_distances.append(statistics['best_distance_so_far'])
+
+    return np.array(elapsed_times), np.array(best_distances)
+
+
+def best_at(elapsed_times, best_distances, checkpoint):
+    """Finds the best distance found by a given time.
+
+    Args:
+        elapsed_times (numpy ndarray): time at the end of each epoch, s
+        best_distances (numpy ndarray): best distance found by the end of each epoch
+        checkpoint (float): time, s
+
+    Returns:
+        best_distance (float): best distance found by the checkpoint, or nan if no epoch had finished
+    """
+
+    finished = np.searchsorted(elapsed_times, checkpoint, side='right')
+
+    return best_distances[finished - 1] if finished else np.nan
+
+
+def main():
+    rseeds = [40, 41, 42, 43, 44]
+
+    # Load data
+    building_G = load_pickle('final_building_network.pickle')
+    distance_matrix, room_list = load_or_create_distance_matrix(building_G)
+    map_dict = create_mapping(room_list)
+    route_length = 22
+
+    # Set up genetic algorithm parameters, shared by every configuration. Each run is stopped by the time budget, long
+    # before max_epochs, and only the history of the latest epochs is kept
+    max_epochs = 10 ** 6
+    population_size = 200
+    elite_number = 25
+    mutation_rate = 0.8
+    time_budget = 2.0
+    checkpoints = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0]
+
+    # Plain GA against the GA with a local search stage, improving either the elites or random children
+    configurations = {
+        'plain GA': lambda: None,
+        'memetic (elites)': lambda: LocalSearch(apply_to='elites', number_of_routes=5),
+        'memetic (children)': lambda: LocalSearch(apply_to='children', number_of_routes=5, time_budget=0.005),
+    }
+
+    print(f"Mean best distance (m) found by each time, over {len(rseeds)} seeds")
+    print(f"{'configuration':<20}" + "".join(f"{f'{checkpoint} s':>10}" for checkpoint in checkpoints))
+    for name, create_local_search in configurations.items():
+        results = []
+        for rseed in rseeds:
+            genetic_algorithm = GeneticAlgorithm(route_length,
+                                                 max_epochs,
+                                                 population_size,
+                                                 elite_number,
+                                                 mutation_rate,
+                                                 map_dict,
+                                                 seed=rseed,
+                                                 local_search=create_local_search(),
+                                                 stopping_criteria=StoppingCriteria(time_budget=time_budget),
+                                                 history_size=100)
+            elapsed_times, best_distances = run_timed(genetic_algorithm, distance_matrix, route_length, map_dict)
+            results.append([best_at(elapsed_times, best_distances, checkpoint) for checkpoint in checkpoints])
+
+        print(f"{name:<20}" + "".join(f"{distance:>10.2f}" for distance in np.mean(results, axis=0)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,61 @@
-import random
-import numpy as np
-
-from ga_mappings import load_pickle, create_distance_matrix, create_mapping
+from ga_mappings import load_pickle, create_mapping, reverse_room_mapping
+from lazy_distance_matrix import LazyDistanceMatrix
+from distance_matrix_cache import load_or_create_distance_matrix
 
 from genetic_algorithm import GeneticAlgorithm
+from held_karp import HELD_KARP_MAX_ROOMS, solve_held_karp
 
 
 def main():
     rseed = 40
-    random.seed(rseed)
-    np.random.seed(rseed)
 
-    # Load data
+    # Load data. A cached matrix is memory-mapped from disk if this network has been seen before, otherwise
+    # distance matrix rows are only calculated for the rooms the route visits.
+    cached_bool = True
     building_G = load_pickle('final_building_network.pickle')
-    distance_matrix, room_list = create_distance_matrix(building_G)
+    if cached_bool:
+        distance_matrix, room_list = load_or_create_distance_matrix(building_G)
+    else:
+        distance_matrix = LazyDistanceMatrix(building_G)
+        room_list = distance_matrix.room_list
     map_dict = create_mapping(room_list)
 
     # Define problem: how many rooms must be visited?
     route_length = 22
-    print(f"The nurse must visit the following rooms once: {room_list[:route_length]}")
-
-    # Random population?
-    random_bool = True
-
-    # Set up genetic algorithm parameters and run
-    epochs = 2000
-    population_size = 200
-    elite_number = 25
-    mutation_rate = 0.8
-
-    genetic_algorithm = GeneticAlgorithm(route_length,
-                                         epochs,
-                                         population_size,
-                                         elite_number,
-                                         mutation_rate,
-                                         map_dict)
-
-    genetic_algorithm.run(distance_matrix, route_length, map_dict, random_bool)
-    genetic_algorithm.process_outputs(map_dict)
+    print(f"The nurse must visit the following rooms once: {room_list[:route_length - 1]}")
+
+    # Small rounds are solved exactly. Run the GA as well, to measure its optimality gap?
+    compare_bool = False
+    optimal_distance = None
+    if route_length - 1 <= HELD_KARP_MAX_ROOMS:
+        optimal_route, optimal_distance = solve_held_karp(distance_matrix, list(map_dict.keys())[:route_length - 1])
+        print(f"Optimal solution: {optimal_distance:.2f} m")
+        print(f"The optimal route is: {reverse_room_mapping(optimal_route, map_dict)}")
+
+    if optimal_distance is None or compare_bool:
+        # Random population?
+        random_bool = True
+
+        # Set up genetic algorithm parameters and run
+        epochs = 2000
+        population_size = 200
+        elite_number = 25
+        mutation_rate = 0.8
+
+        genetic_algorithm = GeneticAlgorithm(route_length,
+                                             epochs,
+                                             population_size,
+                                             elite_number,
+                                             mutation_rate,
+                                             map_dict,
+                                             seed=rseed)
+
+        genetic_algorithm.run(distance_matrix, route_length, map_dict, random_bool)
+        genetic_algorithm.process_outputs(map_dict, optimal_distance)
+
+    if not cached_bool:
+        cache_info = distance_matrix.cache_info()
+        print(f"Distance matrix rows materialised: {cache_info['rows_materialised']} of {cache_info['total_rows']}")
 
 
 if __name__ == "__main__":
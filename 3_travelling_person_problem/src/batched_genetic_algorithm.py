@@ -0,0 +1,250 @@
+from collections import defaultdict
+import numpy as np
+
+from ga_operators import order_crossover_batch, swap_mutation_batch
+
+
+class BatchedGeneticAlgorithm:
+    """Class to optimise many independent rounds over the same building together, e.g. one round per nurse on a shift.
+    Every round must visit the same number of rooms, but the rooms themselves can differ.
+
+    The populations of all rounds are stacked into a single 3D array of shape (rounds, population_size, route_length),
+    so each step of an epoch (evaluation, elitism, tournament selection, crossover and mutation) is one numpy operation
+    over every round at once, and the per-epoch overhead is paid once per batch rather than once per round.
+
+    Genes are local room indexes: gene i of a round refers to room round_rooms[round, i]. Local index 0 is the
+    start/end room of every round, and every route is a permutation of the same local indexes, so the batched
+    crossover and mutation operators of the GeneticAlgorithm apply unchanged to the flattened population. Distances
+    are found by mapping the local indexes of each round to room indexes in the shared distance matrix.
+    """
+
+    def __init__(self, round_rooms, epochs, population_size, elite_number, mutation_rate, seed=None,
+                 tournament_size=3):
+        """Initialises the stacked population of every round.
+
+        Args:
+            round_rooms (numpy ndarray): 2D array of the room indexes of each round, one round per row, each starting
+            with its start/end room
+            epochs (int): number of generations that the GA runs for in the optimisation
+            population_size (int): number of individuals in the population of each round
+            elite_number (int): number of elites of each round that carry through to the next epoch population
+            mutation_rate (float): percentage chance of mutation (a gene swap), i.e. 5% -> 0.05
+            seed (int or SeedSequence): seed of the random number generator, used for every random draw
+            tournament_size (int): number of individuals in each selection tournament
+        """
+
+        self.rng = np.random.default_rng(seed)
+        self.round_rooms = np.asarray(round_rooms)
+        self.epochs = epochs
+        self.population_size = population_size
+        self.elite_number = elite_number
+        self.mutation_rate = mutation_rate
+        self.tournament_size = tournament_size
+        self.number_of_rounds, self.rooms_per_round = self.round_rooms.shape
+        self.population = self._create_random_population()
+        self.population_distances = None
+        self.min_distances = None
+        self.best_routes = None
+        self.best_distances = None
+
+    def _create_random_population(self):
+        """Creates a random population for every round. Each route starts at local room 0, visits the other rooms of
+        its round once in a random order, and returns to local room 0.
+
+        Returns:
+            population (numpy ndarray): array of routes of local room indexes, of shape
+            (number_of_rounds, population_size, rooms_per_round + 1)
+        """
+
+        number_of_routes = self.number_of_rounds * self.population_size
+        other_rooms = self.rng.permuted(np.tile(np.arange(1, self.rooms_per_round), (number_of_routes, 1)), axis=1)
+        start_rooms = np.zeros((number_of_routes, 1), dtype=other_rooms.dtype)
+        routes = np.hstack([start_rooms, other_rooms, start_rooms])
+
+        return routes.reshape(self.number_of_rounds, self.population_size, -1)
+
+    def _calculate_population_distances(self, population, distance_matrix):
+        """Calculates the total distance of every route of every round at once. Local room indexes are mapped to room
+        indexes in the distance matrix through each round's rooms, and the legs of each route are summed.
+
+        Args:
+            population (numpy ndarray): 3D array of routes of local room indexes, one population per round
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
+
+        Returns:
+            distances (numpy ndarray): total distance of each route, of shape (number_of_rounds, routes per round)
+        """
+
+        rooms = self.round_rooms[np.arange(self.number_of_rounds)[:, None, None], population]
+
+        return distance_matrix[rooms[:, :, :-1], rooms[:, :, 1:]].sum(axis=2)
+
+    def _find_elites(self):
+        """Finds the indexes of the elites of each round, sorted from shortest to longest route.
+
+        Returns:
+            elite_idxs (numpy ndarray): indexes of the elites, of shape (number_of_rounds, elite_number)
+        """
+
+        elite_idxs = np.argpartition(self.population_distances, self.elite_number - 1, axis=1)[:, :self.elite_number]
+        elite_order = np.argsort(np.take_along_axis(self.population_distances, elite_idxs, axis=1), axis=1)
+
+        return np.take_along_axis(elite_idxs, elite_order, axis=1)
+
+    def _select_candidates(self, elite_idxs):
+        """Creates the candidates of each round: its elites, followed by the winners of tournaments between random
+        individuals of that round, run for every round at once.
+
+        Args:
+            elite_idxs (numpy ndarray): indexes of the elites of each round
+
+        Returns:
+            candidates (numpy ndarray): 3D array of candidate routes, one population per round
+        """
+
+        number_of_selections = self.population_size - self.elite_number
+        contestants = self.rng.integers(0, self.population_size,
+                                        size=(self.number_of_rounds, number_of_selections, self.tournament_size))
+        contestant_distances = np.take_along_axis(self.population_distances[:, :, None],
+                                                  contestants.reshape(self.number_of_rounds, -1, 1),
+                                                  axis=1).reshape(contestants.shape)
+        winners = np.take_along_axis(contestants, np.argmin(contestant_distances, axis=2)[:, :, None], axis=2)[:, :, 0]
+
+        selection_idxs = np.concatenate([elite_idxs, winners], axis=1)
+
+        return np.take_along_axis(self.population, selection_idxs[:, :, None], axis=1)
+
+    def _create_new_population(self, candidates):
+        """Creates the new population of each round: its elites carry forward, and the rest are children of pairs of
+        shuffled candidates of the same round, created with ordered crossover across every round at once.
+
+        Args:
+            candidates (numpy ndarray): 3D array of candidate routes, one population per round
+
+        Returns:
+            new_population (numpy ndarray): 3D array of routes, one population per round
+        """
+
+        number_of_children = self.population_size - self.elite_number
+        route_length = candidates.shape[2]
+        shuffled_idxs = self.rng.permuted(np.tile(np.arange(self.population_size), (self.number_of_rounds, 1)), axis=1)
+        parents_1 = np.take_along_axis(candidates, shuffled_idxs[:, :number_of_children, None], axis=1)
+        parents_2 = np.take_along_axis(candidates, shuffled_idxs[:, ::-1][:, :number_of_children, None], axis=1)
+
+        children = order_crossover_batch(parents_1.reshape(-1, route_length), parents_2.reshape(-1, route_length),
+                                         self.rng)
+
+        return np.concatenate([candidates[:, :self.elite_number],
+                               children.reshape(self.number_of_rounds, number_of_children, route_length)], axis=1)
+
+    def _mutate_population(self, new_population):
+        """Mutates every round's population with batched swap mutation, in place. As in the GeneticAlgorithm, about
+        half of each round's elites are mutated as well.
+
+        Args:
+            new_population (numpy ndarray): 3D array of routes, one population per round, mutated in place
+
+        Returns:
+            None
+        """
+
+        first_mutated_idx = int(self.elite_number / 2) + 1
+        mutated_routes = new_population[:, first_mutated_idx:].reshape(-1, new_population.shape[2])
+        swap_mutation_batch(mutated_routes, self.mutation_rate, self.rng)
+        new_population[:, first_mutated_idx:] = mutated_routes.reshape(self.number_of_rounds, -1,
+                                                                        new_population.shape[2])
+
+    def _save_variables(self, epoch):
+        """Saves the best distance of each round for an epoch, and copies the best route of any round that has
+        improved on its best so far.
+
+        Args:
+            epoch (int): index of the epoch, 0 for the first population
+
+        Returns:
+            None
+        """
+
+        min_idxs = np.argmin(self.population_distances, axis=1)
+        min_distances = self.population_distances[np.arange(self.number_of_rounds), min_idxs]
+        self.min_distances[epoch] = min_distances
+
+        improved = min_distances < self.best_distances
+        self.best_distances[improved] = min_distances[improved]
+        self.best_routes[improved] = self.population[np.flatnonzero(improved), min_idxs[improved]]
+
+    def run(self, distance_matrix):
+        """Runs the batched genetic algorithm to optimise every round for distance travelled.
+
+        Args:
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+
+        Returns:
+            None
+        """
+
+        self.min_distances = np.empty((self.epochs + 1, self.number_of_rounds))
+        self.best_distances = np.full(self.number_of_rounds, np.inf)
+        self.best_routes = np.empty((self.number_of_rounds, self.population.shape[2]), dtype=self.population.dtype)
+
+        self.population_distances = self._calculate_population_distances(self.population, distance_matrix)
+        self._save_variables(0)
+
+        for epoch in range(1, self.epochs + 1):
+            elite_idxs = self._find_elites()
+            candidates = self._select_candidates(elite_idxs)
+            self.population = self._create_new_population(candidates)
+            self._mutate_population(self.population)
+            self.population_distances = self._calculate_population_distances(self.population, distance_matrix)
+            self._save_variables(epoch)
+
+    def get_best_routes(self):
+        """Maps the best route of each round back to room indexes in the distance matrix.
+
+        Returns:
+            best_routes (numpy ndarray): best route of room indexes of each round, one round per row
+        """
+
+        return np.take_along_axis(self.round_rooms, self.best_routes, axis=1)
+
+
+def solve_rounds(distance_matrix, rounds, epochs, population_size, elite_number, mutation_rate, seed=None,
+                 tournament_size=3):
+    """Optimises many rounds over the same building. Rounds are grouped by the number of rooms they visit, and each
+    group is solved together by one BatchedGeneticAlgorithm, with its own independent random number stream.
+
+    Args:
+        distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+        rounds (list): room indexes of each round, each starting with its start/end room
+        epochs (int): number of generations that the GA runs for in the optimisation
+        population_size (int): number of individuals in the population of each round
+        elite_number (int): number of elites of each round that carry through to the next epoch population
+        mutation_rate (float): percentage chance of mutation (a gene swap), i.e. 5% -> 0.05
+        seed (int): seed from which an independent random number stream is spawned for every group
+        tournament_size (int): number of individuals in each selection tournament
+
+    Returns:
+        results (list): (best route of room indexes, best distance per epoch) of each round, in the order given
+    """
+
+    round_groups = defaultdict(list)
+    for round_idx, round_rooms in enumerate(rounds):
+        round_groups[len(round_rooms)].append(round_idx)
+
+    results = [None] * len(rounds)
+    group_seeds = np.random.SeedSequence(seed).spawn(len(round_groups))
+    for group_seed, round_idxs in zip(group_seeds, round_groups.values()):
+        batched_genetic_algorithm = BatchedGeneticAlgorithm(np.array([rounds[idx] for idx in round_idxs]),
+                                                            epochs,
+                                                            population_size,
+                                                            elite_number,
+                                                            mutation_rate,
+                                                            seed=group_seed,
+                                                            tournament_size=tournament_size)
+        batched_genetic_algorithm.run(distance_matrix)
+
+        best_routes = batched_genetic_algorithm.get_best_routes()
+        for group_position, round_idx in enumerate(round_idxs):
+            results[round_idx] = (best_routes[group_position], batched_genetic_algorithm.min_distances[:, group_position])
+
+    return results
@@ -0,0 +1,151 @@
+import glob
+import hashlib
+import json
+import os
+import numpy as np
+
+from ga_mappings import create_distance_matrix
+
+
+def fingerprint_graph(G):
+    """Creates a fingerprint of a building graph from its nodes (with parent rooms and degrees), and its edges (with
+    weights). Any change to the network that could change the distance matrix changes the fingerprint, so a cached
+    matrix is never used for a different network.
+
+    Args:
+        G (networkx graph object): final building network graph object
+
+    Returns:
+        fingerprint (str): hex digest of the graph
+    """
+
+    node_records = sorted(f"{node}|{data['parent_room']}|{G.degree(node)}" for node, data in G.nodes(data=True))
+    edge_records = sorted(f"{min(node_1, node_2)}|{max(node_1, node_2)}|{data.get('weight', 1)!r}"
+                          for node_1, node_2, data in G.edges(data=True))
+
+    digest = hashlib.sha256()
+    for record in node_records + edge_records:
+        digest.update(record.encode())
+        digest.update(b"\n")
+
+    return digest.hexdigest()
+
+
+def _get_cache_paths(cache_dir, fingerprint):
+    """Creates the cache file paths for a graph fingerprint.
+
+    Args:
+        cache_dir (str): cache directory
+        fingerprint (str): graph fingerprint
+
+    Returns:
+        matrix_path (str): path of the memory-mapped distance matrix
+        room_list_path (str): path of the room list
+    """
+
+    stem = os.path.join(cache_dir, f"distance_matrix_{fingerprint[:16]}")
+
+    return f"{stem}.npy", f"{stem}_rooms.json"
+
+
+def _remove_old_cache_entries(cache_dir, max_cache_entries):
+    """Bounds the cache to a number of entries, removing the least recently used matrices (and their room lists) first.
+    Each matrix file's modification time is its last use, as it is touched whenever it is loaded. Only complete entries
+    are considered: temporary files that another process is still writing are never touched, and several networks
+    (e.g. the bundled building and synthetic ones) can share the cache without evicting each other on every run.
+
+    Args:
+        cache_dir (str): cache directory
+        max_cache_entries (int): largest number of distance matrices kept in the cache
+
+    Returns:
+        None
+    """
+
+    matrix_paths = glob.glob(os.path.join(cache_dir, "distance_matrix_*.npy"))
+    last_used_times = {}
+    for matrix_path in matrix_paths:
+        try:
+            last_used_times[matrix_path] = os.path.getmtime(matrix_path)
+        except FileNotFoundError:
+            pass
+
+    old_matrix_paths = sorted(last_used_times, key=last_used_times.get, reverse=True)[max_cache_entries:]
+    for matrix_path in old_matrix_paths:
+        for path in [matrix_path, matrix_path[:-len(".npy")] + "_rooms.json"]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _write_cache(cache_dir, fingerprint, distance_matrix, room_list, max_cache_entries):
+    """Writes the distance matrix (as float32) and room list to the cache, and removes the least recently used entries
+    beyond the cache size. Files are written under temporary names and then renamed, so concurrent readers never see a
+    partially written matrix.
+
+    Args:
+        cache_dir (str): cache directory
+        fingerprint (str): graph fingerprint
+        distance_matrix (numpy ndarray): distance matrix between rooms
+        room_list (list): list of rooms in the order of the matrix rows
+        max_cache_entries (int): largest number of distance matrices kept in the cache
+
+    Returns:
+        None
+    """
+
+    os.makedirs(cache_dir, exist_ok=True)
+    matrix_path, room_list_path = _get_cache_paths(cache_dir, fingerprint)
+    temporary_suffix = f".{os.getpid()}.tmp"
+
+    with open(room_list_path + temporary_suffix, 'w') as handle:
+        json.dump(room_list, handle)
+    os.replace(room_list_path + temporary_suffix, room_list_path)
+
+    matrix_file = np.lib.format.open_memmap(matrix_path + temporary_suffix, mode='w+', dtype=np.float32,
+                                            shape=distance_matrix.shape)
+    matrix_file[:] = distance_matrix
+    matrix_file.flush()
+    del matrix_file
+    os.replace(matrix_path + temporary_suffix, matrix_path)
+
+    _remove_old_cache_entries(cache_dir, max_cache_entries)
+
+
+def load_or_create_distance_matrix(G, cache_dir="cache/", n_workers=1, max_cache_entries=8):
+    """Loads the distance matrix for a building graph from the cache, or creates and caches it if this network has not
+    been seen before. The matrix is returned as a read-only float32 memory map, so later runs, and parallel GA workers,
+    share the same pages of the file rather than each recalculating and holding their own copy.
+
+    The cache is keyed by a fingerprint of the graph, so it is invalidated automatically whenever a new network is
+    saved by app 1 and copied here: the new fingerprint misses, and the matrix is calculated again. The cache holds
+    the matrices of the most recently used networks, up to max_cache_entries, so stale matrices are removed over time.
+
+    Args:
+        G (networkx graph object): final building network graph object
+        cache_dir (str): cache directory
+        n_workers (int): number of worker processes used if the matrix has to be calculated
+        max_cache_entries (int): largest number of distance matrices kept in the cache
+
+    Returns:
+        distance_matrix (numpy memmap): read-only distance matrix between rooms
+        room_list (list): list of rooms in the order of the matrix rows
+    """
+
+    fingerprint = fingerprint_graph(G)
+    matrix_path, room_list_path = _get_cache_paths(cache_dir, fingerprint)
+
+    try:
+        # Mark the entry as recently used, so it is the last to be removed
+        os.utime(matrix_path)
+        with open(room_list_path, 'r') as handle:
+            room_list = json.load(handle)
+        return np.load(matrix_path, mmap_mode='r'), room_list
+    except FileNotFoundError:
+        pass
+
+    distance_matrix, room_list = create_distance_matrix(G, n_workers=n_workers)
+    _write_cache(cache_dir, fingerprint, distance_matrix, room_list, max_cache_entries)
+
+    return np.load(matrix_path, mmap_mode='r'), room_list
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import numpy as np
+
+from ga_operators import row_keys
+
+
+class FitnessCache:
+    """Class to memoise the route distances of individuals, so that routes seen before (e.g. duplicates in a converged
+    population) are not evaluated again. Each route is keyed by the bytes of its row, and the cache holds at most
+    max_size routes, evicting the least recently used route when full.
+
+    A cache is only valid for a single distance matrix, as the keys do not include it.
+    """
+
+    def __init__(self, max_size=100000):
+        """Creates an empty cache.
+
+        Args:
+            max_size (int): maximum number of routes held in the cache
+        """
+
+        self.max_size = max_size
+        self.distances = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_distances(self, routes, evaluate):
+        """Finds the distance of every route, from the cache where possible. The routes that miss are evaluated
+        together in one call, and added to the cache.
+
+        Args:
+            routes (numpy ndarray): 2D array of routes, one per row
+            evaluate (function): function that returns the distance of every route in a 2D array of routes
+
+        Returns:
+            distances (numpy ndarray): distance of each route
+        """
+
+        keys = row_keys(routes).tolist()
+        distances = np.empty(len(keys))
+
+        missing_idxs = []
+        for idx, key in enumerate(keys):
+            distance = self.distances.get(key)
+            if distance is None:
+                missing_idxs.append(idx)
+            else:
+                self.distances.move_to_end(key)
+                distances[idx] = distance
+
+        if missing_idxs:
+            distances[missing_idxs] = evaluate(routes[missing_idxs])
+            for idx in missing_idxs:
+                self.distances[keys[idx]] = distances[idx]
+            while len(self.distances) > self.max_size:
+                self.distances.popitem(last=False)
+
+        self.hits += len(keys) - len(missing_idxs)
+        self.misses += len(missing_idxs)
+
+        return distances
+
+    def hit_rate(self):
+        """Calculates the fraction of lookups that were found in the cache.
+
+        Returns:
+            hit_rate (float): hits / lookups, or 0 if there have been no lookups
+        """
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
@@ -1,8 +1,8 @@
-import random
 import networkx as nx
 import pickle
 import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 
 def load_pickle(filename):
@@ -22,7 +22,7 @@ def load_pickle(filename):
 
 
 def _get_room_list(G):
-    """Parses a building network object, and creates a list of rooms (excluding the corridor)
+    """Parses a building network object, and creates a list of rooms (excluding the corridors)
 
     Args:
         G (networkx graph object): final building network graph object, with data attached (created in
@@ -35,43 +35,98 @@ def _get_room_list(G):
     room_list = []
     for node, data in G.nodes(data=True):
         parent_room = data['parent_room']
-        if parent_room not in room_list and parent_room != 'corridor':
+        if parent_room not in room_list and not parent_room.startswith('corridor'):
             room_list.append(parent_room)
 
     return room_list
 
 
-def _get_node_for_room(G, room_name):
-    """Selects the lowest degree node for a given room. This node will be the node that is travelled to
-    in the travelling person problem. For most rooms this is degree 1, but some rooms are "through" rooms
-    and do not have a degree 1 node. If there are multiple nodes of the same degree the first index is
-    returned.
+def _get_room_nodes(G, room_list):
+    """Selects the lowest degree node for every room, in a single pass over the graph. This node will be the node that
+    is travelled to in the travelling person problem. For most rooms this is degree 1, but some rooms are "through"
+    rooms and do not have a degree 1 node. If there are multiple nodes of the same degree the first is returned.
 
     Args:
         G (networkx graph object): final building network graph object, with data attached (created in
         app 1 in portfolio project)
-        room_name (str): name of room to select a node for
+        room_list (list): list of rooms to select a node for
 
     Returns:
-        room node name (str): minimum node name of given room
+        room_nodes (list): minimum degree node name of each room, in the order of room_list
     """
 
-    room_nodes = {node: data for node, data in G.nodes(data=True) if data['parent_room'] == room_name}
-    room_node_list = list(room_nodes.keys())
-    room_node_degrees = [G.degree(node) for node in room_node_list]
-    min_index = np.argmin(room_node_degrees)
+    min_degree_nodes = {}
+    for node, degree in G.degree():
+        parent_room = G.nodes[node]['parent_room']
+        if parent_room not in min_degree_nodes or degree < min_degree_nodes[parent_room][1]:
+            min_degree_nodes[parent_room] = (node, degree)
 
-    return room_node_list[min_index]
+    return [min_degree_nodes[room_name][0] for room_name in room_list]
 
 
-def create_distance_matrix(G):
+_worker_G = None
+_worker_room_nodes = None
+
+
+def _initialise_worker(G, room_nodes):
+    """Stores the building graph and room nodes in module level variables of each worker process, so that they are
+    transferred to a worker once, rather than once per row of the distance matrix.
+
+    Args:
+        G (networkx graph object): final building network graph object
+        room_nodes (list): node name of each room in the distance matrix
+
+    Returns:
+        None
+    """
+
+    global _worker_G, _worker_room_nodes
+    _worker_G, _worker_room_nodes = G, room_nodes
+
+
+def _calculate_distance_row(G, source, room_nodes):
+    """Calculates one row of the distance matrix with a single Dijkstra search from the source node, which finds the
+    shortest path length to every node in the graph at once. Unreachable rooms are given an infinite distance.
+
+    Args:
+        G (networkx graph object): final building network graph object
+        source (str): node name of the room the row is calculated for
+        room_nodes (list): node name of each room in the distance matrix
+
+    Returns:
+        distance_row (numpy ndarray): shortest path length from the source to each room
+    """
+
+    path_lengths = nx.single_source_dijkstra_path_length(G, source, weight='weight')
+
+    return np.array([path_lengths.get(node, np.inf) for node in room_nodes])
+
+
+def _calculate_distance_row_in_worker(source):
+    """Calculates one row of the distance matrix using the graph held by the worker process.
+
+    Args:
+        source (str): node name of the room the row is calculated for
+
+    Returns:
+        distance_row (numpy ndarray): shortest path length from the source to each room
+    """
+
+    return _calculate_distance_row(_worker_G, source, _worker_room_nodes)
+
+
+def create_distance_matrix(G, n_workers=1):
     """Creates a distance matrix between every room in the clinic (given by room_list). This distance is
-    calculated using the shortest path algorithm shown in app 2, using nx.shortest_path_length(). Consecutive
-    room repeats are not possible, but zeros are entered on the diagonal.
+    calculated using the shortest path algorithm shown in app 2: one single-source Dijkstra search per room fills a
+    whole row at once. The building graph is undirected, so each row also fills its column, and the final room needs
+    no search at all. Consecutive room repeats are not possible, but zeros are entered on the diagonal.
+
+    Rows are independent, so they can be spread across worker processes for large buildings.
 
     Args:
         G (networkx graph object): final building network graph object, with data attached (created in
         app 1 in portfolio project)
+        n_workers (int): number of worker processes used to calculate rows, 1 runs in the current process
 
     Returns:
         distance_matrix (numpy ndarray): array populated between rooms at the i, j indexes in room_list
@@ -79,53 +134,50 @@ def create_distance_matrix(G):
     """
 
     room_list = _get_room_list(G)
-    distance_matrix = np.empty([len(room_list), len(room_list)])
-    for i, room_name_1 in enumerate(room_list):
-        node_1 = _get_node_for_room(G, room_name_1)
-        for j, room_name_2 in enumerate(room_list):
-            node_2 = _get_node_for_room(G, room_name_2)
-            distance_matrix[i][j] = shortest_path_length = nx.shortest_path_length(G, source=node_1, target=node_2, weight='weight')
+    room_nodes = _get_room_nodes(G, room_list)
+    source_nodes = room_nodes[:-1]
+
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 initializer=_initialise_worker,
+                                 initargs=(G, room_nodes)) as executor:
+            chunksize = max(1, len(source_nodes) // (4 * n_workers))
+            distance_rows = list(executor.map(_calculate_distance_row_in_worker, source_nodes, chunksize=chunksize))
+    else:
+        distance_rows = [_calculate_distance_row(G, source, room_nodes) for source in source_nodes]
+
+    distance_matrix = np.zeros([len(room_list), len(room_list)])
+    for i, distance_row in enumerate(distance_rows):
+        distance_matrix[i, i:] = distance_row[i:]
+        distance_matrix[i:, i] = distance_row[i:]
 
     return distance_matrix, room_list
 
 
 def create_mapping(room_list):
-    """So that we can run/test/debug the genetic algorithm with simple alphabetical characters, we need
-    to create a mapping dictionary. This dictionary holds a mapping of room name to alphabetical character.
-    A simple assertion is made to check whether the number of rooms in the room_list is too great for a 26
-    alphabetical character logic (this probably would not break as other non-alphabetical characters exist,
-    but has not been tested).
+    """Creates a mapping dictionary from integer room index to room name. Routes are represented in the genetic
+    algorithm as integer arrays, where each gene is the index of a room in room_list, and therefore also a row/column
+    index of the distance matrix. This mapping is only needed to turn routes back into room names for output.
 
     Args:
         room_list (list): list of rooms that can be travelled to in the building
 
     Returns:
-        map dict (dict): dictionary of room_name: map character for each room in the building
+        map dict (dict): dictionary of room index: room name for each room in the building
     """
 
-    assert len(room_list) <= 26, "Too many rooms for a simple mapping"
-
-    map_dict = {}
-    for idx, room in enumerate(room_list):
-        start = ord('a')
-        room_label = chr(start + idx)
-        map_dict[room_label] = room
-
-    return map_dict
+    return {idx: room for idx, room in enumerate(room_list)}
 
 
 def reverse_room_mapping(individual, map_dict):
-    """Simple function to get the room name for a given alphabetical character in the mapping dict
+    """Simple function to get the room names for a route of integer room indexes, using the mapping dict
 
     Args:
-        individual (list): a single individual containing a list of alphabetical characters
-        map_dict (dict): dictionary of room_name: map character for each room in the building
+        individual (numpy ndarray): a single individual containing an array of room indexes
+        map_dict (dict): dictionary of room index: room name for each room in the building
 
     Returns:
         list of rooms (list): a list/sequence of rooms that are visited
     """
 
-    return [map_dict[letter] for letter in individual]
-
-
-
+    return [map_dict[room_idx] for room_idx in np.asarray(individual).tolist()]
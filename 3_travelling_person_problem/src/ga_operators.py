@@ -0,0 +1,123 @@
+import numpy as np
+
+
+def row_keys(population):
+    """Views each row of a 2D array as a single opaque (np.void) value, so whole routes can be compared, hashed, or
+    passed to np.unique at once, without a Python loop over the rows.
+
+    Args:
+        population (numpy ndarray): 2D array of routes, one per row
+
+    Returns:
+        row_keys (numpy ndarray): 1D array of one opaque value per row
+    """
+
+    rows = np.ascontiguousarray(population)
+
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+
+
+def order_crossover_batch(parents_1, parents_2, rng):
+    """Creates one child per pair of parents using ordered crossover (Davis), for a whole batch of parents at once. For
+    each pair, two cut points are drawn, the sub-chromosome between them is copied and kept in place from parent_1,
+    and the remaining gaps are filled with the remaining genes of parent_2, in the order they appear in parent_2.
+
+    The first and last genes are the fixed start/end room, and are never moved: crossover only acts on the genes in
+    between. Every individual must be a permutation of the same set of rooms.
+
+    Args:
+        parents_1 (numpy ndarray): 2D array of parent routes, one per row
+        parents_2 (numpy ndarray): 2D array of parent routes, paired row by row with parents_1
+        rng (numpy Generator): random number generator
+
+    Returns:
+        children (numpy ndarray): 2D array of child routes, one per pair of parents
+    """
+
+    children = parents_1.copy()
+    inner_1, inner_2 = parents_1[:, 1:-1], parents_2[:, 1:-1]
+    number_of_pairs, inner_length = inner_1.shape
+    if number_of_pairs == 0 or inner_length < 2:
+        return children
+
+    # Cut points per pair, and a mask of the sub-chromosome kept from parent_1
+    cuts = np.sort(rng.integers(0, inner_length + 1, size=(number_of_pairs, 2)), axis=1)
+    positions = np.arange(inner_length)
+    in_segment = (positions >= cuts[:, :1]) & (positions < cuts[:, 1:])
+
+    # For every gene of parent_2, find its position in parent_1, and so whether it is in parent_1's sub-chromosome
+    gene_ranks = np.searchsorted(np.sort(inner_1[0]), inner_2)
+    positions_in_parent_1 = np.take_along_axis(np.argsort(inner_1, axis=1), gene_ranks, axis=1)
+    remaining_genes = ~np.take_along_axis(in_segment, positions_in_parent_1, axis=1)
+
+    # Each row has the same number of gaps as remaining genes, so row-major boolean indexing pairs them up in order
+    inner_children = inner_1.copy()
+    inner_children[~in_segment] = inner_2[remaining_genes]
+    children[:, 1:-1] = inner_children
+
+    return children
+
+
+def _swapped_edge_lengths(population, rows, positions_1, positions_2, distance_matrix):
+    """Sums the lengths of the edges touched by swapping two positions of a route. Only the edges either side of the
+    two positions change: (a - 1, a), (a, a + 1), (b - 1, b) and (b, b + 1), where a < b. When the positions are
+    adjacent, (a, a + 1) and (b - 1, b) are the same edge, so it is only counted once.
+
+    Args:
+        population (numpy ndarray): 2D array of routes, one per row
+        rows (numpy ndarray): rows of the routes being swapped
+        positions_1 (numpy ndarray): first position of each swap
+        positions_2 (numpy ndarray): second position of each swap
+        distance_matrix (numpy ndarray): distance matrix of each room to each other room
+
+    Returns:
+        edge_lengths (numpy ndarray): total length of the touched edges of each route
+    """
+
+    lower, upper = np.minimum(positions_1, positions_2), np.maximum(positions_1, positions_2)
+    edge_starts = np.stack([lower - 1, lower, upper - 1, upper])
+    edge_lengths = distance_matrix[population[rows, edge_starts], population[rows, edge_starts + 1]]
+    edge_lengths[2] = np.where(upper - 1 != lower, edge_lengths[2], 0)
+
+    return edge_lengths.sum(axis=0)
+
+
+def swap_mutation_batch(population, mutation_rate, rng, distances=None, distance_matrix=None):
+    """Mutates a whole population by swapping rooms, in place. As in the per-gene mutation scheme, each individual has
+    one chance per gene of a swap, with probability mutation_rate, between two random positions. The number of swaps
+    of every individual is drawn up front (a binomial draw), and the k-th swap of every individual that has at least k
+    swaps is applied to all of them at once. The fixed start/end room (the first and last genes) is never swapped.
+
+    If the route distances of the population are given, they are updated in place as the swaps are made. A swap only
+    changes the (at most) four edges either side of the swapped rooms, so the change in distance is found from those
+    edges alone, before and after the swap, rather than by re-evaluating the whole route.
+
+    Args:
+        population (numpy ndarray): 2D array of routes, one per row, mutated in place
+        mutation_rate (float): chance of a swap per gene
+        rng (numpy Generator): random number generator
+        distances (numpy ndarray): total distance of each route, updated in place (optional)
+        distance_matrix (numpy ndarray): distance matrix, required if distances are given
+
+    Returns:
+        swap_counts (numpy ndarray): number of swaps made to each individual
+    """
+
+    population_size, route_length = population.shape
+    swap_counts = rng.binomial(route_length, mutation_rate, size=population_size)
+    if route_length < 4 or population_size == 0:
+        return np.zeros(population_size, dtype=int)
+
+    for swap_round in range(swap_counts.max()):
+        rows = np.flatnonzero(swap_counts > swap_round)
+        positions_1, positions_2 = rng.integers(1, route_length - 1, size=(2, len(rows)))
+        if distances is not None:
+            distances[rows] -= _swapped_edge_lengths(population, rows, positions_1, positions_2, distance_matrix)
+
+        genes_1, genes_2 = population[rows, positions_1], population[rows, positions_2]
+        population[rows, positions_1], population[rows, positions_2] = genes_2, genes_1
+
+        if distances is not None:
+            distances[rows] += _swapped_edge_lengths(population, rows, positions_1, positions_2, distance_matrix)
+
+    return swap_counts
@@ -0,0 +1,116 @@
+import numpy as np
+
+
+def find_elites(distances, elite_number):
+    """Finds the indexes of the elite individuals, i.e. those with the shortest routes. np.argpartition finds the
+    elites in linear time, and only the elites themselves are then sorted, from best to worst.
+
+    Args:
+        distances (numpy ndarray): total distance travelled along each route in the population
+        elite_number (int): number of elites
+
+    Returns:
+        elite_idxs (numpy ndarray): indexes of the elites, sorted from shortest to longest route
+    """
+
+    if elite_number <= 0:
+        return np.empty(0, dtype=int)
+    if elite_number >= len(distances):
+        return np.argsort(distances, kind='stable')
+
+    elite_idxs = np.argpartition(distances, elite_number - 1)[:elite_number]
+
+    return elite_idxs[np.argsort(distances[elite_idxs], kind='stable')]
+
+
+def probability_selection(population_fitness, number_of_selections, rng):
+    """Selects individuals with probabilities proportional to their fitness, without replacement. This is the original
+    selection scheme of the GA. Sampling without replacement slows down sharply for large populations, so one of the
+    other strategies should be preferred for populations of thousands of individuals.
+
+    Args:
+        population_fitness (numpy ndarray): fitness of each individual
+        number_of_selections (int): number of individuals to select
+        rng (numpy Generator): random number generator
+
+    Returns:
+        selection_idxs (numpy ndarray): indexes of the selected individuals
+    """
+
+    probabilities = population_fitness / population_fitness.sum()
+
+    return rng.choice(len(population_fitness), size=number_of_selections, p=probabilities, replace=False)
+
+
+def tournament_selection(population_fitness, number_of_selections, rng, tournament_size=3):
+    """Selects individuals by tournament: for each selection, tournament_size individuals are drawn at random (with
+    replacement), and the fittest of them wins. All tournaments are run at once, in O(number_of_selections *
+    tournament_size) time, independent of the population size.
+
+    Args:
+        population_fitness (numpy ndarray): fitness of each individual
+        number_of_selections (int): number of individuals to select
+        rng (numpy Generator): random number generator
+        tournament_size (int): number of individuals in each tournament
+
+    Returns:
+        selection_idxs (numpy ndarray): indexes of the selected individuals
+    """
+
+    contestants = rng.integers(0, len(population_fitness), size=(number_of_selections, tournament_size))
+    winners = np.argmax(population_fitness[contestants], axis=1)
+
+    return contestants[np.arange(number_of_selections), winners]
+
+
+def stochastic_universal_sampling(population_fitness, number_of_selections, rng):
+    """Selects individuals with stochastic universal sampling. Individuals are laid out on a line with lengths
+    proportional to their fitness, and number_of_selections evenly spaced pointers, with a single random offset, pick
+    the selections. This has the same expected selections as fitness proportional sampling, with much lower variance,
+    and needs one cumulative sum and one sorted search.
+
+    Args:
+        population_fitness (numpy ndarray): fitness of each individual
+        number_of_selections (int): number of individuals to select
+        rng (numpy Generator): random number generator
+
+    Returns:
+        selection_idxs (numpy ndarray): indexes of the selected individuals
+    """
+
+    cumulative_fitness = np.cumsum(population_fitness)
+    step = cumulative_fitness[-1] / number_of_selections
+    pointers = rng.random() * step + step * np.arange(number_of_selections)
+    selection_idxs = np.searchsorted(cumulative_fitness, pointers, side='right')
+
+    return np.minimum(selection_idxs, len(population_fitness) - 1)
+
+
+def rank_selection(population_fitness, number_of_selections, rng):
+    """Selects individuals with linear rank-based probabilities: the fittest individual has weight n, the next n - 1,
+    and so on. Selection pressure therefore depends only on the ordering of the population, not on the spread of
+    fitness values, which stops a few very fit individuals from taking over. Ranks come from a single np.argsort, and
+    selections are drawn with stochastic universal sampling.
+
+    Args:
+        population_fitness (numpy ndarray): fitness of each individual
+        number_of_selections (int): number of individuals to select
+        rng (numpy Generator): random number generator
+
+    Returns:
+        selection_idxs (numpy ndarray): indexes of the selected individuals
+    """
+
+    population_size = len(population_fitness)
+    ranks = np.empty(population_size)
+    ranks[np.argsort(population_fitness, kind='stable')] = np.arange(1, population_size + 1)
+
+    return stochastic_universal_sampling(ranks, number_of_selections, rng)
+
+
+SELECTION_STRATEGIES = {
+    'probability': probability_selection,
+    'tournament': tournament_selection,
+    'stochastic_universal': stochastic_universal_sampling,
+    'rank': rank_selection,
+}
@@ -1,11 +1,23 @@
-import random
+from contextlib import closing
 import numpy as np
-import operator
+import os
+import pickle
+import time
+import warnings
 
 from ga_mappings import reverse_room_mapping
+from ga_operators import order_crossover_batch, swap_mutation_batch, row_keys
+from ga_selection import find_elites, SELECTION_STRATEGIES
+from fitness_cache import FitnessCache
+from optimisation_history import OptimisationHistory
+from seeding import create_seeded_routes, repair_route
 
 from tsp_visualisation import visualise_fitness
 
+# Below this mutation rate, routes get few enough swaps per epoch that updating distances from the edges each swap
+# changes is cheaper than re-evaluating the mutated routes in full (measured break-even is around 0.05)
+INCREMENTAL_DISTANCE_MAX_RATE = 0.05
+
 
 class GeneticAlgorithm:
     """Class to control the genetic algorithm (GA) optimisation of a travelling person problem, applied to
@@ -14,20 +26,45 @@ class GeneticAlgorithm:
     of populations etc, but does require a more complex initialisation.
 
     The GA operates in a fairly standard way, using order crossover to generate children, mutation to add
-    variation, and elitism to ensure the strongest individuals progress through epochs.
+    variation, and elitism to ensure the strongest individuals progress through epochs. The selection strategy used
+    to pick the rest of the candidates is pluggable (see ga_selection.py).
 
     There are a couple of problem-specific adjustments: the nurse must start and end at the same point
     (in the spirit of the original tsp problem), and the nurse does not have to visit any room more than
-    once in their round (mutation swaps genes, ensuring this).
+    once in their round (mutation swaps genes, ensuring this). The start/end room is fixed as the first room of
+    the route, which does not change the length of a closed round, and is never moved by crossover or mutation.
+
+    Crossover and mutation are applied to the whole population at once with numpy operators, and all random draws
+    come from a single numpy Generator owned by the class, so runs are reproducible from the seed alone. The route
+    distance of every individual is tracked alongside its genes: swap mutations update it from the few edges they
+    change, children that are copies of a parent inherit it, and full re-evaluation is only needed for new children
+    and for a periodic consistency check. Optionally, those full evaluations go through a bounded LRU cache of route
+    distances, so duplicate routes in a converged population are only evaluated once.
+
+    An optional local search stage (see local_search.py) improves some routes each epoch with 2-opt and Or-opt moves,
+    which makes the GA a memetic algorithm, and usually converges in far fewer epochs. Part of the first population
+    can also be seeded with tours from construction heuristics (see seeding.py), rather than being entirely random,
+    or warm started from the best route of a previous run. Long runs can be checkpointed, and resumed from the
+    checkpoint with load_checkpoint(). Progress can be followed epoch by epoch, either by iterating over iterate(), or
+    by passing a callback to run().
+
+    Optionally, the mutation rate adapts each epoch to the diversity of the population (see mutation_schedule.py), and
+    duplicate individuals are replaced by random routes, so the population neither stagnates nor thrashes.
     """
 
-    def __init__(self, route_length, epochs, population_size, elite_number, mutation_rate, map_dict):
+    def __init__(self, route_length, epochs, population_size, elite_number, mutation_rate, map_dict, seed=None,
+                 selection='probability', consistency_check_interval=100, local_search=None, seeding=None,
+                 seed_perturbation_rate=0.05, stopping_criteria=None, fitness_cache_size=None, warm_start_route=None,
+                 warm_start_fraction=0.25, checkpoint_path=None, checkpoint_interval=100, history_size=None,
+                 mutation_schedule=None, replace_duplicates=False):
         """The initialisation of the GA occurs here. In particular, the first population is generated, and
         stored in self.population. A future version of this class could utilise dataclasses to reduce
         boilerplate.
 
-        A population contains n individuals, each a list of l alphabetical characters representing room
-        names. The individual length is problem specific, and equal to the route_length parameter.
+        A population is a 2D integer numpy array of n individuals (rows), each a route of l room indexes. Each room
+        index is also the row/column of that room in the distance matrix, so the whole population can be evaluated with
+        a single indexing operation.
+        The individual length is problem specific, and equal to the route_length parameter.
 
         Args:
             route_length (int): number of rooms that must be visited by the nurse/person. Sets the
@@ -36,237 +73,335 @@ class GeneticAlgorithm:
             population_size (int): number of individuals in the population
             elite_number (int): number of elites that carry through to the next epoch population
             mutation_rate (float): percentage chance of mutation (a gene swap), i.e. 5% -> 0.05
-            map_dict (dict): dictionary containing room name and character representation mapping
+            map_dict (dict): dictionary containing room index and room name mapping
+            seed (int): seed of the GA's own random number generator, used for every random draw
+            selection (str or callable): selection strategy for the non-elite candidates, one of 'probability',
+            'tournament', 'stochastic_universal' or 'rank', or a function with the same signature as those in
+            ga_selection.py
+            consistency_check_interval (int): number of epochs between full re-evaluations of the tracked distances
+            local_search (LocalSearch): local search applied to some routes each epoch (optional)
+            seeding (dict): fraction of the first population seeded by each construction heuristic, e.g.
+            {'nearest_neighbour': 0.1, 'greedy_edge': 0.05, 'cheapest_insertion': 0.05} (optional)
+            seed_perturbation_rate (float): chance of a swap per gene, used to perturb the seeded routes for diversity
+            stopping_criteria (StoppingCriteria): criteria to stop the run before the full number of epochs (optional)
+            fitness_cache_size (int): maximum number of route distances held in the fitness cache (None for no cache)
+            warm_start_route (numpy ndarray): best route of room indexes from a previous run, repaired to fit this
+            round and used to seed part of the first population (optional)
+            warm_start_fraction (float): fraction of the first population seeded from the warm start route
+            checkpoint_path (str): path of the checkpoint file saved during the run (None for no checkpoints)
+            checkpoint_interval (int): number of epochs between checkpoints
+            history_size (int): if set, only the history of the most recent history_size epochs is kept, in a ring
+            buffer, otherwise the history of every epoch is kept
+            mutation_schedule (AdaptiveMutation): schedule that adapts the mutation rate each epoch, starting from
+            mutation_rate (optional)
+            replace_duplicates (bool): if True, duplicate individuals are replaced by random routes each epoch
         """
 
+        self.rng = np.random.default_rng(seed)
         self.epochs = epochs
         self.population_size = population_size
         self.elite_number = elite_number
         self.mutation_rate = mutation_rate
-        self.min_distances = []
-        self.min_individuals = []
+        self.selection = SELECTION_STRATEGIES[selection] if isinstance(selection, str) else selection
+        self.consistency_check_interval = consistency_check_interval
+        self.local_search = local_search
+        self.seeding = seeding
+        self.seed_perturbation_rate = seed_perturbation_rate
+        self.stopping_criteria = stopping_criteria
+        self.stop_reason = None
+        self.fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size else None
+        self.warm_start_route = warm_start_route
+        self.warm_start_fraction = warm_start_fraction
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.mutation_schedule = mutation_schedule
+        self.replace_duplicates = replace_duplicates
+        self.epochs_run = 0
+        self.number_of_evaluations = 0
+        self.number_of_delta_updates = 0
+        self.history = OptimisationHistory(history_size or epochs + 1, ring_buffer=history_size is not None)
         self.population = self._create_random_population(route_length, map_dict)
+        self.population_distances = None
 
     def _create_route(self, route_length, map_dict):
-        """Method to create a route of alphabetical characters, related to their respective room names,
-        of the correct route length.
+        """Method to create a random route of room indexes of the correct route length. The route starts at the first
+        of the first route_length - 1 rooms, visits each of the others once in a random order, and returns to the
+        start room.
 
         Args:
             route_length (int): number of rooms that must be visited by the nurse/person. Sets the
             individual length.
-            map_dict (dict): dictionary containing room name and character representation mapping
+            map_dict (dict): dictionary containing room index and room name mapping
 
         Returns:
-            route (list): list of alphabetical characters representing a route of room names
+            route (numpy ndarray): array of room indexes representing a route
         """
 
-        possible_rooms = list(map_dict.keys())
-        route_rooms = possible_rooms[:route_length]
-        route = random.sample(route_rooms, route_length - 1)
-        route.append(route[0])
-
-        return route
+        route_rooms = np.array(list(map_dict.keys())[:route_length - 1])
+        start_room = route_rooms[0]
 
+        return np.concatenate([[start_room], self.rng.permutation(route_rooms[1:]), [start_room]])
 
     def _create_random_population(self, route_length, map_dict):
-        """Method to create a random population of the correct population size
+        """Method to create a random population of the correct population size. The population is stored as a 2D
+        integer array, with one individual (route) per row.
 
         Args:
-            route_length
-            map_dict (dict): dictionary containing room name and character representation mapping
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the
+            individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
 
         Returns:
-            population (list): list of individuals (i.e. routes)
+            population (numpy ndarray): array of individuals (i.e. routes), of shape (population_size, route_length)
+        """
+
+        return np.stack([self._create_route(route_length, map_dict) for _ in range(0, self.population_size)])
+
+    def _seed_population(self, distance_matrix, route_length, map_dict):
+        """Replaces the first individuals of the population with seeded routes: first those built by construction
+        heuristics, in the mix given by self.seeding, then copies of the warm start route, repaired to visit exactly
+        the rooms of this round. All but one of the warm start copies are perturbed for diversity. The rest of the
+        population stays random.
+
+        Args:
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the
+            individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
+
+        Returns:
+            None
         """
 
-        return [self._create_route(route_length, map_dict) for _ in range(0, self.population_size)]
+        route_rooms = np.array(list(map_dict.keys())[:route_length - 1])
+        seeded_routes = [np.empty((0, route_length), dtype=self.population.dtype)]
+        if self.seeding is not None:
+            seeded_routes.append(create_seeded_routes(distance_matrix, route_rooms, self.seeding, self.population_size,
+                                                      self.seed_perturbation_rate, self.rng))
+        if self.warm_start_route is not None:
+            warm_start_route = repair_route(self.warm_start_route, route_rooms, distance_matrix)
+            number_of_copies = max(int(round(self.warm_start_fraction * self.population_size)), 1)
+            warm_start_routes = np.tile(warm_start_route, (number_of_copies, 1))
+            swap_mutation_batch(warm_start_routes[1:], self.seed_perturbation_rate, self.rng)
+            seeded_routes.append(warm_start_routes)
+
+        seeded_routes = np.concatenate(seeded_routes)[:self.population_size]
+        self.population = self.population.copy()
+        self.population[:len(seeded_routes)] = seeded_routes
+        self.population_distances = None
+
+    def _calculate_population_distances(self, population, distance_matrix):
+        """Method to calculate the total distance travelled along every route in a population at once. The distance of
+        every leg of every route is looked up with one fancy-indexing operation, distance_matrix[route[i], route[i + 1]]
+        for each row, and the legs of each route are summed.
+
+        For a route of 1 -> 2 -> 3, the distance matrix is polled for 1 -> 2: matrix[1][2], and then
+        matrix[2][3], returning two distances, which are summed.
 
-    def _calculate_individual_fitness(self, individual, distance_matrix):
-        """Method to calculate the fitness of an individual. This is 1 / the total distance travelled in the
-        route, as we want to maximise fitness and minimise distance.
+        Args:
+            population (numpy ndarray): 2D array of individuals, one route of room indexes per row
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
+
+        Returns:
+            distances (numpy ndarray): total distance travelled along each route
+        """
+
+        return distance_matrix[population[:, :-1], population[:, 1:]].sum(axis=1)
 
-        For a route of a -> b -> c, the distance matrix is polled for a -> b: matrix[1][2], and then
-        matrix[2][3], returning two distances. These would be summed, and then inverted, to get the
-        fitness of the route/individual.
+    def _evaluate_routes(self, routes, distance_matrix):
+        """Evaluates the total distance of routes in full, through the fitness cache if there is one, and counts the
+        routes evaluated. The periodic consistency check bypasses this, so that it always compares against a fresh
+        evaluation.
 
         Args:
-            individual (list): list of characters representing a route
+            routes (numpy ndarray): 2D array of routes, one per row
             distance_matrix (numpy ndarray): distance matrix of each room to each other room
 
         Returns:
-            fitness (float): 1 / total distance travelled in the individuals route
+            distances (numpy ndarray): total distance travelled along each route
         """
 
-        total_distance = 0
-        for idx, label in enumerate(individual[:-1]):
-            matrix_index_i = ord(label) - ord('a')
-            matrix_index_j = ord(individual[idx + 1]) - ord('a')
-            total_distance += distance_matrix[matrix_index_i][matrix_index_j]
+        self.number_of_evaluations += len(routes)
+        if self.fitness_cache is None:
+            return self._calculate_population_distances(routes, distance_matrix)
 
-        return 1 / total_distance
+        return self.fitness_cache.get_distances(
+            routes, lambda missing_routes: self._calculate_population_distances(missing_routes, distance_matrix))
 
     def _calculate_fitness(self, distance_matrix):
-        """Method to assess the fitness of every individual in the population, returning sorted values.
+        """Method to assess the fitness of every individual in the population. The fitness of an individual is 1 / the
+        total distance travelled in its route, as we want to maximise fitness and minimise distance. The tracked route
+        distances are used, and are only calculated in full (in one vectorised operation) if the population is new.
+        The elites are found with np.argpartition.
 
         Args:
             distance_matrix (numpy ndarray): distance matrix of each room to each other room
 
         Returns:
-            sorted_population_fitness (dict): dictionary containing sorted index and fitness
+            population_fitness (numpy ndarray): fitness of each individual, in population order
+            elite_idxs (numpy ndarray): indexes of the elites, sorted from fittest to least fit
             min_idx (int): index of the best individual
             min_distance (float): min distance travelled by the best individual
         """
 
-        population_fitness = {}
-        for idx, individual in enumerate(self.population):
-            fitness = self._calculate_individual_fitness(individual, distance_matrix)
-            population_fitness[idx] = fitness
+        if self.population_distances is None:
+            self.population_distances = self._evaluate_routes(self.population, distance_matrix)
 
-        sorted_population_fitness = dict(sorted(population_fitness.items(), key=lambda item: item[1], reverse=True))
-        min_idx = list(sorted_population_fitness.keys())[0]
-        min_distance = round(1 / sorted_population_fitness[min_idx], 2)
+        distances = self.population_distances
+        population_fitness = 1 / distances
+        elite_idxs = find_elites(distances, max(self.elite_number, 1))
+        min_idx = elite_idxs[0]
+        min_distance = round(float(distances[min_idx]), 2)
 
-        return sorted_population_fitness, min_idx, min_distance
+        return population_fitness, elite_idxs[:self.elite_number], min_idx, min_distance
 
-    def _probability_selection(self, sorted_population_fitness):
-        """Creates a list of candidates using elitism, and then selection via probabilities based on
-        fitness. For the elitism stage, the top n individuals are transferred to the candidate population.
-
-        For the remaining candidates, probabilities for each individual are created, and then individuals
-        are drawn from a bucket based on these probabilities.
+    def _select_candidates(self, population_fitness, elite_idxs):
+        """Creates a set of candidates using elitism, and then the selection strategy. For the elitism stage, the top n
+        individuals are transferred to the candidate population. The remaining candidates are chosen by the selection
+        strategy, e.g. by fitness proportional probabilities, or by tournament.
 
         Args:
-            sorted_population_fitness (dict): dictionary containing sorted index and fitness
+            population_fitness (numpy ndarray): fitness of each individual, in population order
+            elite_idxs (numpy ndarray): indexes of the elites, sorted from fittest to least fit
 
         Returns:
-            candidate_individuals (list): list of potential candidates to make the next population from
+            candidate_individuals (numpy ndarray): potential candidates to make the next population from
+            candidate_distances (numpy ndarray): route distance of each candidate
         """
 
-        probabilities = {idx: fitness / sum(sorted_population_fitness.values()) for idx, fitness in sorted_population_fitness.items()}
-        sorted_individual_idxs = list(sorted_population_fitness.keys())
-
-        selection_idxs = []
-        for i in range(0, self.elite_number):
-            elite_id = sorted_individual_idxs[i]
-            selection_idxs.append(elite_id)
+        remaining_required = len(population_fitness) - len(elite_idxs)
+        selected_idxs = self.selection(population_fitness, remaining_required, self.rng)
+        selection_idxs = np.concatenate([elite_idxs, selected_idxs])
 
-        remaining_required = len(sorted_individual_idxs) - self.elite_number
-        tournament_selection = list(np.random.choice(sorted_individual_idxs, size=remaining_required, p=list(probabilities.values()), replace=False))
-        selection_idxs += tournament_selection
-        candidate_individuals = [self.population[idx] for idx in selection_idxs]
+        return self.population[selection_idxs], self.population_distances[selection_idxs]
 
-        return candidate_individuals
+    def _create_new_population(self, candidates, candidate_distances, distance_matrix):
+        """Creates a new population, using elitism and crossover. The elites are carried forward, and the rest of the
+        population is made of children, created from pairs of shuffled candidates with batched ordered crossover.
 
-    def _order_crossover(self, parent_1, parent_2):
-        """Creates a child from two parents, based on ordered crossover. Two points are randomly generated,
-        a sub-chromosome copied and kept in place from parent_1, and the remaining gaps filled with the
-        remaining genes from parent_2. This ensures that no repeat genes occur. To finish, the start room
-        is copied, to ensure that the nurse starts and ends in the same place.
+        Elites keep their distances. A child that is identical to one of its parents (e.g. when the crossover
+        sub-chromosome is empty or covers the whole route) inherits that parent's distance, and only the remaining
+        children are evaluated in full.
 
         Args:
-            parent_1 (list): an individual containing a list of characters representing a route
-            parent_2 (list): an individual containing a list of characters representing a route
+            candidates (numpy ndarray): array of candidate individuals to make a population from
+            candidate_distances (numpy ndarray): route distance of each candidate
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
 
         Returns:
-            child (list): an individual containing a list of characters representing a route
+            children (numpy ndarray): a new population
+            children_distances (numpy ndarray): route distance of each individual in the new population
         """
 
-        trimmed_parent_1, trimmed_parent_2 = parent_1[:-1], parent_2[:-1]
-        cross_a, cross_b = np.random.randint(0, len(trimmed_parent_1), size=2)
-        min_cross = min(cross_a, cross_b)
-        max_cross = max(cross_a, cross_b)
-        remains_idx = [idx for idx, _ in enumerate(trimmed_parent_1) if idx not in range(min_cross, max_cross)]
-        sub_chromosome = trimmed_parent_1[min_cross:max_cross]
-
-        # Fill the remains indices with the remains from parent 2
-        parent_2_remains = [gene for gene in trimmed_parent_2 if gene not in sub_chromosome]
-        for idx, remains_idx in enumerate(remains_idx):
-            parent_2_gene = parent_2_remains[idx]
-            if remains_idx < min_cross:
-                sub_chromosome.insert(min_cross-1, parent_2_gene)
-            else:
-                sub_chromosome.insert(max_cross+1, parent_2_gene)
-
-        sub_chromosome.append(sub_chromosome[0])
-        child = sub_chromosome
-
-        return child
-
-    def _create_new_population(self, candidates):
-        """Creates a new population, using elitism and crossover.
+        number_of_children = self.population_size - self.elite_number
+        shuffled_idxs = self.rng.permutation(len(candidates))
+        parent_1_idxs = shuffled_idxs[:number_of_children]
+        parent_2_idxs = shuffled_idxs[::-1][:number_of_children]
+        children = order_crossover_batch(candidates[parent_1_idxs], candidates[parent_2_idxs], self.rng)
+
+        # Inherit distances where a child is a copy of a parent, and evaluate the rest
+        children_distances = np.empty(number_of_children)
+        same_as_parent_1 = np.all(children == candidates[parent_1_idxs], axis=1)
+        same_as_parent_2 = np.all(children == candidates[parent_2_idxs], axis=1) & ~same_as_parent_1
+        new_children = ~(same_as_parent_1 | same_as_parent_2)
+        children_distances[same_as_parent_1] = candidate_distances[parent_1_idxs[same_as_parent_1]]
+        children_distances[same_as_parent_2] = candidate_distances[parent_2_idxs[same_as_parent_2]]
+        children_distances[new_children] = self._evaluate_routes(children[new_children], distance_matrix)
+
+        return (np.concatenate([candidates[:self.elite_number], children]),
+                np.concatenate([candidate_distances[:self.elite_number], children_distances]))
+
+    def _mutate_population(self, new_population, new_distances, distance_matrix):
+        """Mutates each individual in a population, by swapping rooms with batched swap mutation. We mutate ~half the
+        elites as well, to add slightly more variation to the new population.
+
+        Route distances are kept up to date. At low mutation rates each swap updates the distance from the four edges
+        it changes, and the routes updated this way are counted separately from the routes evaluated in full. At high
+        mutation rates most routes get many swaps, and re-evaluating just the routes that were swapped in one
+        vectorised operation is cheaper.
 
         Args:
-            candidates (list): list of candidate individuals to make a population from
+            new_population (numpy ndarray): array of individuals
+            new_distances (numpy ndarray): route distance of each individual
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
 
         Returns:
-            children (list): a new population
+            population_with_mutation (numpy ndarray): a mutated population
+            mutated_distances (numpy ndarray): route distance of each individual in the mutated population
         """
 
-        children = []
-        pool_size = len(candidates) - self.elite_number
-        shuffled_selected_ids = random.sample(candidates, len(candidates))
-
-        # Carry elites forward
-        children += candidates[:self.elite_number]
+        population_with_mutation, mutated_distances = new_population.copy(), new_distances.copy()
+        first_mutated_idx = int(self.elite_number / 2) + 1
 
-        # Create the rest of the children using crossover
-        for i in range(0, pool_size-self.elite_number):
-            parent_1, parent_2 = shuffled_selected_ids[i], shuffled_selected_ids[len(candidates) - i - 1]
-            child = self._order_crossover(parent_1, parent_2)
-            children.append(child)
+        if self.mutation_rate <= INCREMENTAL_DISTANCE_MAX_RATE:
+            swap_counts = swap_mutation_batch(population_with_mutation[first_mutated_idx:],
+                                              self.mutation_rate,
+                                              self.rng,
+                                              mutated_distances[first_mutated_idx:],
+                                              distance_matrix)
+            self.number_of_delta_updates += np.count_nonzero(swap_counts)
+        else:
+            swap_counts = swap_mutation_batch(population_with_mutation[first_mutated_idx:], self.mutation_rate, self.rng)
+            mutated_idxs = first_mutated_idx + np.flatnonzero(swap_counts)
+            mutated_distances[mutated_idxs] = self._evaluate_routes(population_with_mutation[mutated_idxs],
+                                                                    distance_matrix)
 
-        return children
+        return population_with_mutation, mutated_distances
 
-    def _mutate_individual(self, individual):
-        """Mutates each individual based on a mutation rate, by swapping rooms.
+    def _replace_duplicates(self, distance_matrix):
+        """Replaces every duplicate individual in the population with a random route, keeping the first copy of each.
+        The elites are at the start of the population, so an elite is always kept in preference to its copies. Each
+        row is viewed as a single opaque value, so duplicates are found with one np.unique.
 
         Args:
-            individual (list): a non-mutated individual
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
 
         Returns:
-            individual (list): a potentially mutated individual
+            None
         """
 
-        for _ in individual:
-            if random.random() < self.mutation_rate:
-                idx_1, idx_2 = np.random.randint(1, len(individual)-1, size=2)
-                gene_1, gene_2 = individual[idx_1], individual[idx_2]
-                individual[idx_1], individual[idx_2] = gene_2, gene_1
+        _, first_idxs = np.unique(row_keys(self.population), return_index=True)
+        duplicate_idxs = np.setdiff1d(np.arange(len(self.population)), first_idxs)
+        if len(duplicate_idxs) == 0:
+            return
 
-        return individual
+        random_routes = self.population[duplicate_idxs]
+        random_routes[:, 1:-1] = self.rng.permuted(random_routes[:, 1:-1], axis=1)
+        self.population[duplicate_idxs] = random_routes
+        self.population_distances[duplicate_idxs] = self._evaluate_routes(random_routes, distance_matrix)
 
-    def _mutate_population(self, new_population):
-        """Mutates each individual in a population. We mutate ~half the elites as well, to add slightly more variation
-        to the new population.
+    def _apply_local_search(self, distance_matrix, route_length, map_dict):
+        """Improves some routes of the population with the local search, in place, keeping their tracked distances up
+        to date. The local search neighbour lists are built the first time it is applied.
 
         Args:
-            new_population (list): a list of individuals
+            distance_matrix (numpy ndarray): matrix of distances between rooms
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the
+            individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
 
         Returns:
-            population_with_mutation (list): a mutated population
+            None
         """
 
-        population_with_mutation = []
-        for idx, individual in enumerate(new_population):
-            if idx > self.elite_number / 2:
-                mutated_individual = self._mutate_individual(individual)
-                population_with_mutation.append(mutated_individual)
-            else:
-                population_with_mutation.append(individual)
+        if self.local_search.route_rooms is None:
+            self.local_search.prepare(distance_matrix, np.array(list(map_dict.keys())[:route_length - 1]))
 
-        return population_with_mutation
+        elite_idxs = find_elites(self.population_distances, self.elite_number)
+        self.local_search.improve_population(self.population, self.population_distances, elite_idxs, self.rng)
 
     def _create_next_generation(self, distance_matrix, random_bool, route_length, map_dict):
         """Create the next generation population by running a routine. The class population attribute is updated. The
         new population is created by assessing the fitness of the current population, creating a new candidate pool
         using elitism and probability selection, and finally mutating the candidate pool to create a new population.
+        Duplicate routes are then replaced, and some of the new routes improved by the local search, if these are set.
 
         Args:
             distance_matrix (numpy ndarray): matrix of distances between rooms
             random_bool (bool): if True, population is selected randomly
             route_length (int): number of rooms that must be visited by the nurse/person. Sets the
             individual length.
-            map_dict (dict): dictionary containing room name and character representation mapping
+            map_dict (dict): dictionary containing room index and room name mapping
 
         Returns:
             None
@@ -274,73 +409,289 @@ class GeneticAlgorithm:
 
         if random_bool:
             self.population = self._create_random_population(route_length, map_dict)
+            self.population_distances = None
 
         else:
-            sorted_population_fitness, _, _ = self._calculate_fitness(distance_matrix)
-            new_candidates = self._probability_selection(sorted_population_fitness)
-            new_population = self._create_new_population(new_candidates)
-            self.population = self._mutate_population(new_population)
+            population_fitness, elite_idxs, _, _ = self._calculate_fitness(distance_matrix)
+            candidates, candidate_distances = self._select_candidates(population_fitness, elite_idxs)
+            new_population, new_distances = self._create_new_population(candidates, candidate_distances, distance_matrix)
+            self.population, self.population_distances = self._mutate_population(new_population, new_distances,
+                                                                                 distance_matrix)
+            if self.replace_duplicates:
+                self._replace_duplicates(distance_matrix)
+            if self.local_search is not None:
+                self._apply_local_search(distance_matrix, route_length, map_dict)
+
+    def _save_variables(self):
+        """Records the best, mean and worst route distance and the diversity of the population each epoch in the
+        history, which also keeps a copy of the best route whenever it improves. The tracked route distances must be up
+        to date.
 
-    def _save_variables(self, min_idx, min_distance):
-        """Saves the min index and distance of the best individual in the population each epoch to the data stores
-        in the class attributes.
+        Returns:
+            None
+        """
+
+        self.history.record(self.population, self.population_distances)
+
+    def _check_distance_consistency(self, distance_matrix):
+        """Re-evaluates every route in full and compares the result with the tracked distances. Incremental updates
+        should match to within floating point rounding; any drift is corrected, and a larger mismatch raises a warning.
 
         Args:
-            min_idx (int): index of the best individual in the population
-            min_distance (float): the minimum distance travelled along a route by the best candidate
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
 
         Returns:
             None
         """
 
-        self.min_distances.append(min_distance)
-        self.min_individuals.append(self.population[min_idx])
+        full_distances = self._calculate_population_distances(self.population, distance_matrix)
+        if self.population_distances is not None and not np.allclose(self.population_distances, full_distances):
+            warnings.warn("Tracked route distances have drifted from a full re-evaluation, and have been reset")
+        self.population_distances = full_distances
+
+    def _run_epoch(self, distance_matrix, route_length, map_dict, random_bool):
+        """Runs a single epoch: the mutation rate is adapted (if there is a mutation schedule), a new population is
+        created, assessed, and the best individual is saved.
 
-    def run(self, distance_matrix, route_length, map_dict, random_bool):
+        Args:
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the
+            individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
+            random_bool (bool): if True, population is selected randomly
+
+        Returns:
+            None
+        """
+
+        if self.mutation_schedule is not None and self.history.number_recorded:
+            self.mutation_rate = self.mutation_schedule.update(self.mutation_rate, self.history.latest_diversity)
+
+        self._create_next_generation(distance_matrix, random_bool, route_length, map_dict)
+        self.epochs_run += 1
+        if self.consistency_check_interval and self.epochs_run % self.consistency_check_interval == 0:
+            self._check_distance_consistency(distance_matrix)
+
+        self._calculate_fitness(distance_matrix)
+        self._save_variables()
+
+    def get_best_individuals(self, distance_matrix, number_of_individuals):
+        """Returns copies of the best individuals in the current population, e.g. to migrate to another population.
+
+        Args:
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+            number_of_individuals (int): number of individuals to return
+
+        Returns:
+            best_individuals (numpy ndarray): copies of the best individuals, from best to worst
+        """
+
+        self._calculate_fitness(distance_matrix)
+
+        return self.population[find_elites(self.population_distances, number_of_individuals)].copy()
+
+    def receive_migrants(self, migrants, distance_matrix):
+        """Replaces the worst individuals in the current population with migrants from another population.
+
+        Args:
+            migrants (numpy ndarray): individuals to add to the population
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+
+        Returns:
+            None
+        """
+
+        self._calculate_fitness(distance_matrix)
+        worst_idxs = find_elites(-self.population_distances, len(migrants))
+        self.population, self.population_distances = self.population.copy(), self.population_distances.copy()
+        self.population[worst_idxs] = migrants
+        self.population_distances[worst_idxs] = self._evaluate_routes(migrants, distance_matrix)
+
+    def save_checkpoint(self, checkpoint_path):
+        """Saves the state of the run to a checkpoint file: the population and its distances, the state of the random
+        number generator, the current mutation rate (which changes each epoch with a mutation schedule), the number of
+        routes evaluated in full and updated by swap deltas, and the history so far. The file is written under a
+        temporary name and then renamed, so a run killed while saving never leaves a partial checkpoint.
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file
+
+        Returns:
+            None
+        """
+
+        checkpoint = {
+            'population': self.population,
+            'population_distances': self.population_distances,
+            'rng_state': self.rng.bit_generator.state,
+            'epochs_run': self.epochs_run,
+            'mutation_rate': self.mutation_rate,
+            'number_of_evaluations': self.number_of_evaluations,
+            'number_of_delta_updates': self.number_of_delta_updates,
+            'history': self.history,
+        }
+
+        temporary_path = f"{checkpoint_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as handle:
+            pickle.dump(checkpoint, handle)
+        os.replace(temporary_path, checkpoint_path)
+
+    def load_checkpoint(self, checkpoint_path):
+        """Restores the state of a run from a checkpoint file, so that run() carries on from the epoch it was saved at,
+        with the same random number stream. The GA should be initialised with the same parameters as the original run.
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file
+
+        Returns:
+            None
+        """
+
+        with open(checkpoint_path, 'rb') as handle:
+            checkpoint = pickle.load(handle)
+
+        self.population = checkpoint['population']
+        self.population_distances = checkpoint['population_distances']
+        self.rng.bit_generator.state = checkpoint['rng_state']
+        self.epochs_run = checkpoint['epochs_run']
+        self.mutation_rate = checkpoint['mutation_rate']
+        self.number_of_evaluations = checkpoint['number_of_evaluations']
+        self.number_of_delta_updates = checkpoint['number_of_delta_updates']
+        self.history = checkpoint['history']
+
+    def _run_epochs(self, distance_matrix, route_length, map_dict, random_bool):
+        """Generator that runs the genetic algorithm, yielding (None) after each epoch, and stopping at the end of the
+        epochs, when a stopping criterion is met, or when it is closed by its consumer. Nothing is calculated for the
+        consumer, so this adds next to no overhead to a run.
+
+        Args:
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the
+            individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
+            random_bool (bool): if True, population is selected randomly
+
+        Yields:
+            None
+        """
+
+        if self.history.number_recorded == 0:
+            if self.seeding is not None or self.warm_start_route is not None:
+                self._seed_population(distance_matrix, route_length, map_dict)
+
+            self._calculate_fitness(distance_matrix)
+            self._save_variables()
+
+        if self.stopping_criteria is not None:
+            self.stopping_criteria.start()
+
+        # For each epoch, generate a new population and assess it
+        self.stop_reason = None
+        try:
+            while self.epochs_run < self.epochs:
+                self._run_epoch(distance_matrix, route_length, map_dict, random_bool)
+                if self.checkpoint_path is not None and self.epochs_run % self.checkpoint_interval == 0:
+                    self.save_checkpoint(self.checkpoint_path)
+                if self.stopping_criteria is not None:
+                    self.stop_reason = self.stopping_criteria.check(self)
+
+                yield
+                if self.stop_reason is not None:
+                    return
+        except GeneratorExit:
+            self.stop_reason = self.stop_reason or "stopped by the progress consumer"
+            raise
+
+        self.stop_reason = f"all {self.epochs} epochs run"
+
+    def iterate(self, distance_matrix, route_length, map_dict, random_bool=False):
+        """Runs the genetic algorithm as a generator, yielding the statistics of each epoch as soon as it is run, so
+        that progress can be followed (e.g. by a dashboard or a log) while the optimisation is running. Breaking out of
+        the loop stops the run, and the history so far is kept.
+
+        Args:
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the
+            individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
+            random_bool (bool): if True, population is selected randomly
+
+        Yields:
+            statistics (dict): epoch number, the best, mean and worst distance and diversity of the population, the
+            best distance and (read-only) route found so far, and the time since the start of the run, s
+        """
+
+        start_time = time.perf_counter()
+        with closing(self._run_epochs(distance_matrix, route_length, map_dict, random_bool)) as epochs:
+            for _ in epochs:
+                statistics = self.history.get_latest_record()
+                statistics['best_distance_so_far'] = self.history.best_distance
+                statistics['best_route'] = self.history.best_route
+                statistics['elapsed_time'] = time.perf_counter() - start_time
+                yield statistics
+
+    def run(self, distance_matrix, route_length, map_dict, random_bool, callback=None):
         """Runs the genetic algorithm to optimise for distance travelled. Each epoch, the fitnesses of the population
         are assessed, the best individuals found, and a new population created. Data is saved each epoch for parsing
-        later.
+        later. If seeding or a warm start route is set, part of the first population is replaced by seeded routes
+        before the first epoch. If stopping criteria are set, the run stops as soon as one of them is met, otherwise it
+        runs until self.epochs epochs have been run. A run restored from a checkpoint carries on from where it was
+        saved, and a checkpoint is saved every checkpoint_interval epochs if a checkpoint path is set.
+
+        If a callback is given, it is called with the statistics of each epoch (see iterate()), and the run stops if it
+        returns True. Without a callback, no statistics are gathered.
 
         Args:
             distance_matrix (numpy ndarray): matrix of distances between each room and each other room
             route_length (int): number of rooms that must be visited by the nurse/person. Sets the
             individual length.
-            map_dict (dict): dictionary containing room name and character representation mapping
+            map_dict (dict): dictionary containing room index and room name mapping
             random_bool (bool): if True, population is selected randomly
+            callback (function): function called with the statistics of each epoch (optional)
 
         Returns:
             None
         """
 
-        _, min_idx, min_distance = self._calculate_fitness(distance_matrix)
-        self._save_variables(min_idx, min_distance)
+        if callback is None:
+            for _ in self._run_epochs(distance_matrix, route_length, map_dict, random_bool):
+                pass
+            return
 
-        # For each epoch, generate a new population and assess it
-        for _ in range(0, self.epochs):
-            self._create_next_generation(distance_matrix, random_bool, route_length, map_dict)
-            _, min_idx, min_distance = self._calculate_fitness(distance_matrix)
-            self._save_variables(min_idx, min_distance)
+        for statistics in self.iterate(distance_matrix, route_length, map_dict, random_bool):
+            if callback(statistics):
+                break
 
-    def process_outputs(self, map_dict):
+    def process_outputs(self, map_dict, optimal_distance=None):
         """Method to process the outputs, create a visualisation, and print some results to console. The best
-        individual across epochs is found, and the corresponding route is printed. In the future, a visualisation
-        of the route will be created.
+        individual across epochs is taken from the history, and the corresponding route is printed. If the optimal
+        distance is known (e.g. from the exact solver in held_karp.py), the GA's optimality gap is printed too. In the
+        future, a visualisation of the route will be created.
 
         Args:
-            map_dict (dict): mapping dictionary of alphabetical character to room name
+            map_dict (dict): mapping dictionary of room index to room name
+            optimal_distance (float): distance of the optimal route (optional)
 
         Returns:
             None
         """
-        best_min_idx, best_min_val = min(enumerate(self.min_distances), key=operator.itemgetter(1))
-        total_improvement = 100 * (self.min_distances[0] - best_min_val) / self.min_distances[0]
-        best_individual = self.min_individuals[best_min_idx]
-        best_route = reverse_room_mapping(best_individual, map_dict)
+        history = self.history
+        best_min_val = history.best_distance
+        total_improvement = 100 * (history.first_best_distance - best_min_val) / history.first_best_distance
+        best_route = reverse_room_mapping(history.best_route, map_dict)
 
         # Create output visualisation
-        visualise_fitness(self.min_distances)
+        visualise_fitness(history.best_distances, history.mean_distances, history.worst_distances, history.epochs)
 
         # Print some info to console
-        print(f"Shortest initial distance: {self.min_distances[0]} m")
-        print(f"Best solution found: {best_min_val:.2f} m, an improvement of {total_improvement:.2f} %")
+        print(f"Stopped after {history.number_recorded - 1} epochs: {self.stop_reason}")
+        print(f"Shortest initial distance: {history.first_best_distance:.2f} m")
+        print(f"Best solution found: {best_min_val:.2f} m (epoch {history.best_epoch}), "
+              f"an improvement of {total_improvement:.2f} %")
         print(f"The best route found is: {best_route}")
+        if self.fitness_cache is not None:
+            print(f"Fitness cache: {self.fitness_cache.hits} hits, {self.fitness_cache.misses} misses, "
+                  f"a hit rate of {100 * self.fitness_cache.hit_rate():.2f} %")
+        if optimal_distance is not None:
+            optimality_gap = 100 * (best_min_val - optimal_distance) / optimal_distance
+            print(f"Optimal distance: {optimal_distance:.2f} m, the GA's optimality gap is {optimality_gap:.2f} %")
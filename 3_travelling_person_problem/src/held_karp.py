@@ -0,0 +1,115 @@
+from math import comb
+import numpy as np
+
+# Largest round (including the start room) solved exactly by default. Held-Karp takes O(2^n n^2) time, so at this
+# size it is quicker than running the GA for thousands of epochs.
+HELD_KARP_MAX_ROOMS = 15
+
+# Memory budget of the dynamic programming tables, bytes
+HELD_KARP_MAX_MEMORY = 512 * 2 ** 20
+
+
+def estimate_held_karp_memory(number_of_rooms):
+    """Estimates the peak memory used by solve_held_karp for a round of a given number of rooms. For n rooms other than
+    the start room, the cost table holds 2^n x n floats and the parent table 2^n x n bytes, and the largest layer of
+    subsets holds C(n, n / 2) x n candidate costs while it is being solved.
+
+    Args:
+        number_of_rooms (int): number of rooms in the round, including the start room
+
+    Returns:
+        memory (int): estimated peak memory, bytes
+    """
+
+    other_rooms = max(number_of_rooms - 1, 0)
+    table_memory = 2 ** other_rooms * other_rooms * (8 + 1)
+    layer_memory = comb(other_rooms, other_rooms // 2) * other_rooms * 8 * 2
+
+    return table_memory + layer_memory
+
+
+def _count_bits(masks, number_of_bits):
+    """Counts the set bits of every mask.
+
+    Args:
+        masks (numpy ndarray): integer bitmasks
+        number_of_bits (int): number of bits used by the masks
+
+    Returns:
+        bit_counts (numpy ndarray): number of set bits of each mask
+    """
+
+    bit_counts = np.zeros(len(masks), dtype=np.int64)
+    for bit in range(number_of_bits):
+        bit_counts += (masks >> bit) & 1
+
+    return bit_counts
+
+
+def solve_held_karp(distance_matrix, route_rooms, max_memory=HELD_KARP_MAX_MEMORY):
+    """Finds the exact shortest round visiting every room once, using the Held-Karp dynamic programme. The round starts
+    and ends at the first room, as in GeneticAlgorithm, and takes the same distance matrix.
+
+    For each subset S of the other rooms, and each room j in S, the programme finds the shortest path that starts at
+    the start room, visits every room in S, and ends at j:
+
+        cost(S, j) = min over i in S - {j} of cost(S - {j}, i) + distance(i, j)
+
+    Subsets are bitmasks, and are solved in layers of equal size, so every subset a layer depends on is already
+    solved. Each layer is solved for every end room j at once, with one numpy operation over all of its subsets.
+
+    Args:
+        distance_matrix (numpy ndarray): distance matrix of each room to each other room
+        route_rooms (numpy ndarray): room indexes of the rooms in the round, starting with the start room
+        max_memory (int): memory budget, bytes. A MemoryError is raised if the round needs more.
+
+    Returns:
+        route (numpy ndarray): shortest route of room indexes, starting and ending at the start room
+        distance (float): total distance travelled along the route
+    """
+
+    route_rooms = np.asarray(route_rooms)
+    number_of_others = len(route_rooms) - 1
+    if number_of_others <= 0:
+        return np.array([route_rooms[0], route_rooms[0]]), 0.0
+
+    required_memory = estimate_held_karp_memory(len(route_rooms))
+    if required_memory > max_memory:
+        raise MemoryError(f"An exact solution for {len(route_rooms)} rooms needs ~{required_memory / 2 ** 20:.0f} MB, "
+                          f"more than the budget of {max_memory / 2 ** 20:.0f} MB")
+
+    local_matrix = np.asarray(distance_matrix[np.ix_(route_rooms, route_rooms)], dtype=float)
+    from_start, to_start, between = local_matrix[0, 1:], local_matrix[1:, 0], local_matrix[1:, 1:]
+
+    # cost[mask, j] is the shortest path over the rooms in mask, ending at room j. Unreachable entries stay infinite.
+    number_of_masks = 2 ** number_of_others
+    bits = 1 << np.arange(number_of_others)
+    costs = np.full((number_of_masks, number_of_others), np.inf)
+    parents = np.full((number_of_masks, number_of_others), -1, dtype=np.int8)
+    costs[bits, np.arange(number_of_others)] = from_start
+
+    masks = np.arange(number_of_masks)
+    bit_counts = _count_bits(masks, number_of_others)
+    for subset_size in range(2, number_of_others + 1):
+        layer = masks[bit_counts == subset_size]
+        for end_room in range(number_of_others):
+            end_masks = layer[(layer & bits[end_room]) != 0]
+            candidates = costs[end_masks ^ bits[end_room]] + between[:, end_room]
+            best_previous = np.argmin(candidates, axis=1)
+            costs[end_masks, end_room] = candidates[np.arange(len(end_masks)), best_previous]
+            parents[end_masks, end_room] = best_previous
+
+    # Close the round, then walk back through the parents to recover the order of rooms
+    full_mask = number_of_masks - 1
+    round_costs = costs[full_mask] + to_start
+    room = int(np.argmin(round_costs))
+    distance = float(round_costs[room])
+
+    order, mask = [], full_mask
+    while room >= 0:
+        order.append(room)
+        room, mask = int(parents[mask, room]), mask ^ int(bits[room])
+
+    other_rooms = route_rooms[1:][order[::-1]]
+
+    return np.concatenate([[route_rooms[0]], other_rooms, [route_rooms[0]]]), distance
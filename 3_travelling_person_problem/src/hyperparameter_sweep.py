@@ -0,0 +1,167 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import itertools
+import time
+import numpy as np
+
+from genetic_algorithm import GeneticAlgorithm
+
+
+_worker_distance_matrix = None
+_worker_map_dict = None
+
+
+def create_parameter_grid(parameter_grid):
+    """Creates every combination of the parameter values in a grid.
+
+    Args:
+        parameter_grid (dict): list of values to try for each GeneticAlgorithm parameter, e.g.
+        {'population_size': [100, 200], 'mutation_rate': [0.01, 0.05]}
+
+    Returns:
+        configurations (list): one dictionary of parameter values per combination
+    """
+
+    parameter_names = list(parameter_grid.keys())
+
+    return [dict(zip(parameter_names, values)) for values in itertools.product(*parameter_grid.values())]
+
+
+def _initialise_worker(matrix_path, map_dict):
+    """Memory-maps the cached distance matrix, and stores it with the room mapping in module level variables of each
+    worker process. Every worker maps the same file, so they share one copy of the matrix in memory.
+
+    Args:
+        matrix_path (str): path of the cached distance matrix (.npy)
+        map_dict (dict): dictionary containing room index and room name mapping
+
+    Returns:
+        None
+    """
+
+    global _worker_distance_matrix, _worker_map_dict
+    _worker_distance_matrix, _worker_map_dict = np.load(matrix_path, mmap_mode='r'), map_dict
+
+
+def _run_configuration(route_length, configuration, seed_idx, seed):
+    """Runs the GA once for one configuration, using the distance matrix held by the worker process.
+
+    Args:
+        route_length (int): number of rooms that must be visited by the nurse/person. Sets the individual length.
+        configuration (dict): GeneticAlgorithm parameters of the run
+        seed_idx (int): index of the seed of the run, for the results table
+        seed (SeedSequence): seed of the run's random number generator
+
+    Returns:
+        result (dict): the configuration, with the seed index, best distance found, epochs run and runtime of the run
+    """
+
+    genetic_algorithm = GeneticAlgorithm(route_length, map_dict=_worker_map_dict, seed=seed, **configuration)
+    start_time = time.perf_counter()
+    genetic_algorithm.run(_worker_distance_matrix, route_length, _worker_map_dict, False)
+    runtime = time.perf_counter() - start_time
+
+    return dict(configuration,
+                seed_idx=seed_idx,
+                best_distance=genetic_algorithm.history.best_distance,
+                epochs_run=genetic_algorithm.epochs_run,
+                runtime=runtime)
+
+
+def run_sweep(matrix_path, map_dict, route_length, parameter_grid, number_of_seeds, seed=None, n_workers=None):
+    """Runs the GA for every combination of parameters in a grid, number_of_seeds times each, across a pool of worker
+    processes. Every run has its own independent random number stream, spawned from a single seed, so the sweep is
+    reproducible and no two runs share random draws, whichever process they run in.
+
+    Args:
+        matrix_path (str): path of the cached distance matrix (.npy), shared by every worker
+        map_dict (dict): dictionary containing room index and room name mapping
+        route_length (int): number of rooms that must be visited by the nurse/person. Sets the individual length.
+        parameter_grid (dict): list of values to try for each GeneticAlgorithm parameter, including epochs,
+        population_size, elite_number and mutation_rate
+        number_of_seeds (int): number of runs of each combination
+        seed (int): seed from which the random number stream of every run is spawned
+        n_workers (int): number of worker processes (None for one per CPU)
+
+    Returns:
+        results (list): one result dictionary per run
+    """
+
+    configurations = create_parameter_grid(parameter_grid)
+    run_seeds = np.random.SeedSequence(seed).spawn(len(configurations) * number_of_seeds)
+    runs = [(configuration, seed_idx) for configuration in configurations for seed_idx in range(number_of_seeds)]
+
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_initialise_worker,
+                             initargs=(matrix_path, map_dict)) as executor:
+        futures = [executor.submit(_run_configuration, route_length, configuration, seed_idx, run_seed)
+                   for (configuration, seed_idx), run_seed in zip(runs, run_seeds)]
+        results = [future.result() for future in futures]
+
+    return results
+
+
+def summarise_sweep(results, parameter_names):
+    """Summarises the runs of each combination of parameters: the mean, standard deviation and minimum of the best
+    distance found, and the mean runtime. Combinations are sorted by mean best distance.
+
+    Args:
+        results (list): one result dictionary per run, from run_sweep
+        parameter_names (list): names of the parameters that were swept
+
+    Returns:
+        summary (list): one summary dictionary per combination of parameters
+    """
+
+    runs_by_configuration = {}
+    for result in results:
+        configuration = tuple(result[name] for name in parameter_names)
+        runs_by_configuration.setdefault(configuration, []).append(result)
+
+    summary = []
+    for configuration, runs in runs_by_configuration.items():
+        best_distances = np.array([run['best_distance'] for run in runs])
+        summary.append(dict(zip(parameter_names, configuration),
+                            runs=len(runs),
+                            mean_best_distance=best_distances.mean(),
+                            std_best_distance=best_distances.std(),
+                            min_best_distance=best_distances.min(),
+                            mean_runtime=np.mean([run['runtime'] for run in runs])))
+
+    return sorted(summary, key=lambda row: row['mean_best_distance'])
+
+
+def print_sweep_table(summary):
+    """Prints the sweep summary as a table of quality against runtime.
+
+    Args:
+        summary (list): one summary dictionary per combination of parameters, from summarise_sweep
+
+    Returns:
+        None
+    """
+
+    column_names = list(summary[0].keys())
+    rows = [[f"{value:.2f}" if isinstance(value, float) else str(value) for value in row.values()] for row in summary]
+    column_widths = [max(len(name), *(len(row[idx]) for row in rows)) for idx, name in enumerate(column_names)]
+
+    print("  ".join(name.rjust(width) for name, width in zip(column_names, column_widths)))
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, column_widths)))
+
+
+def save_sweep_table(summary, path):
+    """Saves the sweep summary as a csv file.
+
+    Args:
+        summary (list): one summary dictionary per combination of parameters, from summarise_sweep
+        path (str): path of the csv file
+
+    Returns:
+        None
+    """
+
+    with open(path, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(summary[0].keys()))
+        writer.writeheader()
+        writer.writerows(summary)
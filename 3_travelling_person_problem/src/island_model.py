@@ -0,0 +1,228 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from ga_mappings import reverse_room_mapping
+from genetic_algorithm import GeneticAlgorithm
+
+from tsp_visualisation import visualise_fitness
+
+
+def _island_worker(connection, shared_matrix_name, matrix_shape, matrix_dtype, ga_kwargs, route_length, map_dict,
+                   migration_size):
+    """Runs one island of the island model in its own process. The distance matrix is attached from shared memory,
+    so no island holds its own copy. The island is run through GeneticAlgorithm.iterate(), so seeding and warm starts
+    apply as in a single run, and it waits between epochs for instructions from the main process: each instruction
+    holds a number of epochs to run, and any migrants to add to the population before running them. After each
+    instruction the island sends back its best individuals, for migration. When told to stop, the island sends back
+    its distance history and its best individual.
+
+    Args:
+        connection (multiprocessing Connection): pipe to the main process
+        shared_matrix_name (str): name of the shared memory block holding the distance matrix
+        matrix_shape (tuple): shape of the distance matrix
+        matrix_dtype (str): dtype of the distance matrix
+        ga_kwargs (dict): keyword arguments used to initialise the island's GeneticAlgorithm, including its seed
+        route_length (int): number of rooms that must be visited by the nurse/person. Sets the individual length.
+        map_dict (dict): dictionary containing room index and room name mapping
+        migration_size (int): number of best individuals sent back after each instruction
+
+    Returns:
+        None
+    """
+
+    shared_matrix = shared_memory.SharedMemory(name=shared_matrix_name)
+    try:
+        distance_matrix = np.ndarray(matrix_shape, dtype=matrix_dtype, buffer=shared_matrix.buf)
+        genetic_algorithm = GeneticAlgorithm(route_length, map_dict=map_dict, **ga_kwargs)
+        epochs = genetic_algorithm.iterate(distance_matrix, route_length, map_dict)
+
+        while (instruction := connection.recv()) is not None:
+            number_of_epochs, migrants = instruction
+            if migrants is not None:
+                genetic_algorithm.receive_migrants(migrants, distance_matrix)
+            for _ in range(number_of_epochs):
+                next(epochs)
+
+            connection.send(genetic_algorithm.get_best_individuals(distance_matrix, migration_size))
+
+        epochs.close()
+        history = genetic_algorithm.history
+        connection.send((history.best_distances, history.mean_distances, history.worst_distances,
+                         np.array(history.best_route)))
+        del distance_matrix
+    finally:
+        shared_matrix.close()
+        connection.close()
+
+
+class IslandModel:
+    """Class to control an island model genetic algorithm, where several GeneticAlgorithm populations (islands) evolve
+    in parallel, one per process. Each island has its own independently seeded random number generator, and all of
+    them read the same distance matrix from shared memory.
+
+    Every migration_interval epochs the islands exchange their best individuals around a ring: island i receives the
+    best individuals of island i - 1, which replace its worst individuals. Migration shares good building blocks
+    between islands, while the islands evolving separately in between keeps the overall population diverse.
+    """
+
+    def __init__(self, number_of_islands, migration_interval, migration_size, epochs, population_size, elite_number,
+                 mutation_rate, seed=None, selection='probability', **ga_kwargs):
+        """Stores the island model parameters. The islands themselves are created in separate processes by run().
+
+        Stopping criteria and checkpoints are not supported: the islands run in step, so that their histories can be
+        combined epoch by epoch, and every island would save its checkpoints to the same path.
+
+        Args:
+            number_of_islands (int): number of islands (and processes)
+            migration_interval (int): number of epochs between migrations
+            migration_size (int): number of best individuals sent to the next island at each migration
+            epochs (int): number of generations that each island runs for in the optimisation
+            population_size (int): number of individuals in each island's population
+            elite_number (int): number of elites that carry through to the next epoch population
+            mutation_rate (float): percentage chance of mutation (a gene swap), i.e. 5% -> 0.05
+            seed (int): seed from which an independent random number stream is spawned for every island
+            selection (str or callable): selection strategy used by every island
+            **ga_kwargs: other keyword arguments of GeneticAlgorithm used by every island, e.g. seeding, local_search
+            or mutation_schedule
+        """
+
+        unsupported_kwargs = [name for name in ['stopping_criteria', 'checkpoint_path'] if name in ga_kwargs]
+        if unsupported_kwargs:
+            raise ValueError(f"The island model does not support: {', '.join(unsupported_kwargs)}")
+
+        self.number_of_islands = number_of_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.epochs = epochs
+        self.island_seeds = np.random.SeedSequence(seed).spawn(number_of_islands)
+        self.ga_kwargs = {
+            'epochs': epochs,
+            'population_size': population_size,
+            'elite_number': elite_number,
+            'mutation_rate': mutation_rate,
+            'selection': selection,
+            **ga_kwargs,
+        }
+        self.island_min_distances = []
+        self.min_distances = []
+        self.mean_distances = []
+        self.worst_distances = []
+        self.best_individual = None
+
+    def _start_islands(self, shared_matrix, distance_matrix, route_length, map_dict):
+        """Starts one process per island, each connected to the main process by a pipe.
+
+        Args:
+            shared_matrix (SharedMemory): shared memory block holding the distance matrix
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
+
+        Returns:
+            processes (list): list of island processes
+            connections (list): list of pipes to the island processes
+        """
+
+        processes, connections = [], []
+        for island_seed in self.island_seeds:
+            parent_connection, child_connection = mp.Pipe()
+            ga_kwargs = dict(self.ga_kwargs, seed=island_seed)
+            process = mp.Process(target=_island_worker,
+                                 args=(child_connection, shared_matrix.name, distance_matrix.shape,
+                                       distance_matrix.dtype.str, ga_kwargs, route_length, map_dict,
+                                       self.migration_size))
+            process.start()
+            child_connection.close()
+            processes.append(process)
+            connections.append(parent_connection)
+
+        return processes, connections
+
+    def _run_islands(self, connections):
+        """Runs the islands in rounds of migration_interval epochs. The islands run each round in parallel, and their
+        best individuals are then passed on to the next island around the ring for the start of the following round.
+
+        Args:
+            connections (list): list of pipes to the island processes
+
+        Returns:
+            None
+        """
+
+        migrants = [None for _ in connections]
+        epochs_run = 0
+        while epochs_run < self.epochs:
+            number_of_epochs = min(self.migration_interval, self.epochs - epochs_run)
+            for connection, island_migrants in zip(connections, migrants):
+                connection.send((number_of_epochs, island_migrants))
+
+            best_individuals = [connection.recv() for connection in connections]
+            migrants = best_individuals[-1:] + best_individuals[:-1]
+            epochs_run += number_of_epochs
+
+    def run(self, distance_matrix, route_length, map_dict):
+        """Runs the island model to optimise for distance travelled. The distance matrix is copied into shared memory
+        once, the islands are started, evolved with periodic migration, and their results gathered. The global best
+        distance for each epoch is the minimum across the islands.
+
+        Args:
+            distance_matrix (numpy ndarray): matrix of distances between each room and each other room
+            route_length (int): number of rooms that must be visited by the nurse/person. Sets the individual length.
+            map_dict (dict): dictionary containing room index and room name mapping
+
+        Returns:
+            None
+        """
+
+        distance_matrix = np.ascontiguousarray(distance_matrix)
+        shared_matrix = shared_memory.SharedMemory(create=True, size=distance_matrix.nbytes)
+        processes, connections = [], []
+        try:
+            np.ndarray(distance_matrix.shape, dtype=distance_matrix.dtype, buffer=shared_matrix.buf)[:] = distance_matrix
+            processes, connections = self._start_islands(shared_matrix, distance_matrix, route_length, map_dict)
+            self._run_islands(connections)
+
+            island_results = []
+            for connection in connections:
+                connection.send(None)
+                island_results.append(connection.recv())
+        finally:
+            for connection in connections:
+                connection.close()
+            for process in processes:
+                process.join()
+            shared_matrix.close()
+            shared_matrix.unlink()
+
+        self.island_min_distances = [island_distances for island_distances, _, _, _ in island_results]
+        self.min_distances = np.min(self.island_min_distances, axis=0)
+        self.mean_distances = np.mean([island_means for _, island_means, _, _ in island_results], axis=0)
+        self.worst_distances = np.max([island_worsts for _, _, island_worsts, _ in island_results], axis=0)
+        best_island = int(np.argmin([min(island_distances) for island_distances in self.island_min_distances]))
+        self.best_individual = island_results[best_island][3]
+
+    def process_outputs(self, map_dict):
+        """Method to process the outputs, create a visualisation of the global best distance across epochs, and print
+        some results to console.
+
+        Args:
+            map_dict (dict): mapping dictionary of room index to room name
+
+        Returns:
+            None
+        """
+
+        best_min_val = min(self.min_distances)
+        total_improvement = 100 * (self.min_distances[0] - best_min_val) / self.min_distances[0]
+        best_route = reverse_room_mapping(self.best_individual, map_dict)
+
+        # Create output visualisation
+        visualise_fitness(self.min_distances, self.mean_distances, self.worst_distances)
+
+        # Print some info to console
+        for island_idx, island_distances in enumerate(self.island_min_distances):
+            print(f"Island {island_idx}: best distance {min(island_distances):.2f} m")
+        print(f"Shortest initial distance: {self.min_distances[0]:.2f} m")
+        print(f"Best solution found: {best_min_val:.2f} m, an improvement of {total_improvement:.2f} %")
+        print(f"The best route found is: {best_route}")
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+import numpy as np
+
+from ga_mappings import _get_room_list, _get_room_nodes, _calculate_distance_row
+
+
+class LazyDistanceMatrix:
+    """A room by room distance matrix that is calculated one row at a time, on first access. Each row needs a single
+    Dijkstra search from the room's node, so a route that visits a small subset of the rooms in a large building only
+    pays for the rows of the rooms it visits, rather than the full matrix.
+
+    Rows are memoised in a bounded least recently used cache. Indexing behaves like a 2D numpy array for the forms used
+    by the genetic algorithm (matrix[i][j], matrix[i, j], and integer array indexes), and np.asarray() materialises the
+    full matrix if it is really needed.
+    """
+
+    def __init__(self, G, max_cached_rows=256):
+        """Finds the rooms in the building and their nodes, but does not run any searches.
+
+        Args:
+            G (networkx graph object): final building network graph object, with data attached (created in
+            app 1 in portfolio project)
+            max_cached_rows (int): maximum number of rows held in memory at once
+        """
+
+        self.G = G
+        self.room_list = _get_room_list(G)
+        self.room_nodes = _get_room_nodes(G, self.room_list)
+        self.max_cached_rows = max_cached_rows
+        self.shape = (len(self.room_list), len(self.room_list))
+        self.ndim = 2
+        self.dtype = np.dtype(float)
+        self.rows_materialised = 0
+        self._rows = OrderedDict()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _get_row(self, i):
+        """Returns a row of the matrix, calculating it if it is not in the cache. The least recently used row is
+        evicted if the cache is full.
+
+        Args:
+            i (int): row index
+
+        Returns:
+            distance_row (numpy ndarray): read-only row of distances from room i to every room
+        """
+
+        i = int(i)
+        if i in self._rows:
+            self._rows.move_to_end(i)
+            return self._rows[i]
+
+        distance_row = _calculate_distance_row(self.G, self.room_nodes[i], self.room_nodes)
+        distance_row.flags.writeable = False
+        self.rows_materialised += 1
+
+        self._rows[i] = distance_row
+        if len(self._rows) > self.max_cached_rows:
+            self._rows.popitem(last=False)
+
+        return distance_row
+
+    def _get_rows(self, row_key):
+        """Returns a 2D block of rows for a slice or a list of row indexes.
+
+        Args:
+            row_key (slice or array-like): row indexes
+
+        Returns:
+            distance_rows (numpy ndarray): stacked rows
+        """
+
+        row_indexes = np.arange(self.shape[0])[row_key]
+
+        return np.stack([self._get_row(i) for i in row_indexes])
+
+    def __getitem__(self, key):
+        """Indexes the matrix like a 2D numpy array. Only the rows that are indexed are calculated.
+
+        Args:
+            key (int, slice, array-like or tuple): index into the matrix
+
+        Returns:
+            value (float or numpy ndarray): indexed distances
+        """
+
+        if not isinstance(key, tuple):
+            if np.ndim(key) == 0 and not isinstance(key, slice):
+                return self._get_row(key)
+            return self._get_rows(key)
+
+        row_key, column_key = key
+        if np.ndim(row_key) == 0 and not isinstance(row_key, slice):
+            return self._get_row(row_key)[column_key]
+        if isinstance(row_key, slice) or isinstance(column_key, slice):
+            return self._get_rows(row_key)[:, column_key]
+
+        # Integer array (fancy) indexing: look up each distinct row once
+        row_key, column_key = np.broadcast_arrays(np.asarray(row_key), np.asarray(column_key))
+        distances = np.empty(row_key.shape, dtype=self.dtype)
+        for i in np.unique(row_key):
+            mask = row_key == i
+            distances[mask] = self._get_row(i)[column_key[mask]]
+
+        return distances
+
+    def __array__(self, dtype=None, copy=None):
+        """Materialises the full matrix, e.g. for np.asarray(matrix).
+
+        Returns:
+            distance_matrix (numpy ndarray): the full distance matrix
+        """
+
+        distance_matrix = self._get_rows(slice(None))
+
+        return distance_matrix if dtype is None else distance_matrix.astype(dtype)
+
+    def cache_info(self):
+        """Reports how much of the matrix has been calculated.
+
+        Returns:
+            cache_info (dict): number of rows materialised (searches run), rows currently cached, and total rows
+        """
+
+        return {
+            'rows_materialised': self.rows_materialised,
+            'rows_cached': len(self._rows),
+            'total_rows': self.shape[0],
+        }
@@ -0,0 +1,205 @@
+import time
+import numpy as np
+
+
+class LocalSearch:
+    """Class to improve routes with 2-opt and Or-opt moves, as a local improvement (memetic) stage of the genetic
+    algorithm. Both moves are evaluated in O(1) from the distance matrix, and only moves that connect a room to one of
+    its nearest neighbours are considered, using candidate neighbour lists precomputed from the distance matrix.
+
+    * 2-opt removes two edges of the route, and reconnects it by reversing the section in between.
+    * Or-opt moves a short segment of 1 to 3 consecutive rooms (possibly reversed) to between two other rooms.
+
+    The start/end room is never moved. Routes are searched using plain Python lists of local room indexes, which is
+    much faster than indexing numpy arrays one element at a time.
+    """
+
+    def __init__(self, number_of_neighbours=8, max_passes=20, time_budget=None, apply_to='elites',
+                 number_of_routes=5):
+        """Stores the local search settings. The neighbour lists are built by prepare(), once the distance matrix and
+        the rooms of the route are known.
+
+        Args:
+            number_of_neighbours (int): number of nearest neighbours considered for each room
+            max_passes (int): iteration budget, the maximum number of improvement passes over each route
+            time_budget (float): time budget, the maximum time spent on local search per epoch, s (None for no limit)
+            apply_to (str): 'elites' improves the best routes of each new population, 'children' improves random
+            non-elite routes
+            number_of_routes (int): number of routes improved each epoch
+        """
+
+        self.number_of_neighbours = number_of_neighbours
+        self.max_passes = max_passes
+        self.time_budget = time_budget
+        self.apply_to = apply_to
+        self.number_of_routes = number_of_routes
+        self.route_rooms = None
+        self.local_index = None
+        self.local_matrix = None
+        self.neighbours = None
+        self.moves_applied = 0
+
+    def prepare(self, distance_matrix, route_rooms):
+        """Builds the local distance matrix of the rooms in the route, and the candidate neighbour list of each room.
+
+        Args:
+            distance_matrix (numpy ndarray): distance matrix of each room to each other room
+            route_rooms (numpy ndarray): room indexes of the rooms visited by the route
+
+        Returns:
+            None
+        """
+
+        self.route_rooms = np.asarray(route_rooms)
+        self.local_index = {room: idx for idx, room in enumerate(self.route_rooms.tolist())}
+        local_matrix = np.asarray(distance_matrix[np.ix_(self.route_rooms, self.route_rooms)], dtype=float)
+
+        # Nearest neighbours of each room, excluding itself
+        masked_matrix = local_matrix + np.diag(np.full(len(self.route_rooms), np.inf))
+        number_of_neighbours = min(self.number_of_neighbours, len(self.route_rooms) - 1)
+        self.neighbours = np.argsort(masked_matrix, axis=1)[:, :number_of_neighbours].tolist()
+        self.local_matrix = local_matrix.tolist()
+
+    def _two_opt_pass(self, tour, positions):
+        """Runs one pass of 2-opt over a closed tour. For the edge (a, b) leaving each position, the edge (c, d) leaving
+        each neighbour c of a is considered, and the first time reconnecting the tour as (a, c), (b, d) is shorter, the
+        section from b to c is reversed. Reversing a section is only valid for a symmetric distance matrix, which
+        shortest path distances through a building always are.
+
+        Args:
+            tour (list): closed tour of local room indexes, starting and ending at the start room
+            positions (list): position of each local room index in the tour, updated in place
+
+        Returns:
+            improvement (float): total reduction in distance
+        """
+
+        matrix, number_of_rooms = self.local_matrix, len(tour) - 1
+        improvement = 0.0
+        for i in range(number_of_rooms):
+            a, b = tour[i], tour[i + 1]
+            for c in self.neighbours[a]:
+                j = positions[c]
+                d = tour[j + 1]
+                if c == b or d == a:
+                    continue
+                delta = matrix[a][c] + matrix[b][d] - matrix[a][b] - matrix[c][d]
+                if delta < -1e-9:
+                    low, high = (i + 1, j) if i < j else (j + 1, i)
+                    tour[low:high + 1] = tour[low:high + 1][::-1]
+                    for position in range(low, high + 1):
+                        positions[tour[position]] = position
+                    improvement -= delta
+                    self.moves_applied += 1
+                    break
+
+        return improvement
+
+    def _or_opt_pass(self, tour, positions):
+        """Runs one pass of Or-opt over a closed tour, applying every improving move found. Each segment of 1 to 3
+        rooms (never including the start room) is removed, and reinserted (forwards or reversed) between a
+        neighbour c of its first room and the room after c, if that is shorter.
+
+        Args:
+            tour (list): closed tour of local room indexes, starting and ending at the start room
+            positions (list): position of each local room index in the tour, updated in place
+
+        Returns:
+            improvement (float): total reduction in distance
+        """
+
+        matrix, number_of_rooms = self.local_matrix, len(tour) - 1
+        improvement = 0.0
+        for segment_length in (1, 2, 3):
+            start = 1
+            while start + segment_length <= number_of_rooms:
+                end = start + segment_length - 1
+                first, last = tour[start], tour[end]
+                previous, following = tour[start - 1], tour[end + 1]
+                removal_gain = matrix[previous][first] + matrix[last][following] - matrix[previous][following]
+
+                best_delta, best_move = -1e-9, None
+                for c in self.neighbours[first]:
+                    k = positions[c]
+                    if start - 1 <= k <= end:
+                        continue
+                    c_next = tour[k + 1]
+                    forward = matrix[c][first] + matrix[last][c_next] - matrix[c][c_next] - removal_gain
+                    reverse = matrix[c][last] + matrix[first][c_next] - matrix[c][c_next] - removal_gain
+                    if forward < best_delta:
+                        best_delta, best_move = forward, (k, False)
+                    if reverse < best_delta:
+                        best_delta, best_move = reverse, (k, True)
+
+                if best_move is None:
+                    start += 1
+                    continue
+
+                k, reverse_segment = best_move
+                segment = tour[start:end + 1]
+                if reverse_segment:
+                    segment.reverse()
+                remaining = tour[:start] + tour[end + 1:]
+                insert_at = k + 1 if k < start else k + 1 - segment_length
+                tour[:] = remaining[:insert_at] + segment + remaining[insert_at:]
+                for position, room in enumerate(tour[:-1]):
+                    positions[room] = position
+                improvement -= best_delta
+                self.moves_applied += 1
+                start += 1
+
+        return improvement
+
+    def improve_route(self, route, deadline=None):
+        """Improves a single route with alternating passes of 2-opt and Or-opt, until no improving move is found, the
+        pass budget is used up, or the deadline is reached.
+
+        Args:
+            route (numpy ndarray): route of room indexes, starting and ending at the start room
+            deadline (float): time.perf_counter() value after which no more passes are started (optional)
+
+        Returns:
+            improved_route (numpy ndarray): improved route of room indexes
+            improvement (float): reduction in distance travelled
+        """
+
+        tour = [self.local_index[room] for room in route.tolist()]
+        positions = [0] * len(self.route_rooms)
+        for position, room in enumerate(tour[:-1]):
+            positions[room] = position
+
+        total_improvement = 0.0
+        for _ in range(self.max_passes):
+            improvement = self._two_opt_pass(tour, positions) + self._or_opt_pass(tour, positions)
+            total_improvement += improvement
+            if improvement <= 0 or (deadline is not None and time.perf_counter() > deadline):
+                break
+
+        return self.route_rooms[tour], total_improvement
+
+    def improve_population(self, population, distances, elite_idxs, rng):
+        """Improves some routes of a population in place, and updates their distances. Either the best routes or random
+        non-elite routes are improved, depending on apply_to, until the epoch's time budget is used up.
+
+        Args:
+            population (numpy ndarray): 2D array of routes, one per row, improved in place
+            distances (numpy ndarray): route distance of each individual, updated in place
+            elite_idxs (numpy ndarray): indexes of the best routes, from best to worst
+            rng (numpy Generator): random number generator
+
+        Returns:
+            None
+        """
+
+        if self.apply_to == 'elites':
+            route_idxs = elite_idxs[:self.number_of_routes]
+        else:
+            non_elite_idxs = np.setdiff1d(np.arange(len(population)), elite_idxs)
+            route_idxs = rng.choice(non_elite_idxs, size=min(self.number_of_routes, len(non_elite_idxs)), replace=False)
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        for idx in route_idxs:
+            population[idx], improvement = self.improve_route(population[idx], deadline)
+            distances[idx] -= improvement
+            if deadline is not None and time.perf_counter() > deadline:
+                break
@@ -0,0 +1,40 @@
+class AdaptiveMutation:
+    """Class to adapt the mutation rate of the genetic algorithm each epoch, from the diversity of its population (the
+    fraction of distinct routes, recorded in the history every epoch, so it costs nothing extra).
+
+    When the population loses diversity, e.g. because elites and their copies are taking over, the mutation rate is
+    raised by a constant factor to push it apart again. While diversity is above the target, the rate is lowered by
+    the same factor, so that good routes are not broken up by unnecessary swaps. The rate is kept between a minimum and
+    a maximum.
+    """
+
+    def __init__(self, target_diversity=0.8, min_rate=0.005, max_rate=0.3, adaptation_factor=1.2):
+        """Stores the schedule settings.
+
+        Args:
+            target_diversity (float): fraction of distinct routes in the population to aim for, between 0 and 1
+            min_rate (float): lowest mutation rate allowed
+            max_rate (float): highest mutation rate allowed
+            adaptation_factor (float): factor by which the rate is raised or lowered each epoch
+        """
+
+        self.target_diversity = target_diversity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.adaptation_factor = adaptation_factor
+
+    def update(self, mutation_rate, diversity):
+        """Calculates the mutation rate for the next epoch.
+
+        Args:
+            mutation_rate (float): current mutation rate
+            diversity (float): fraction of distinct routes in the current population
+
+        Returns:
+            mutation_rate (float): mutation rate for the next epoch
+        """
+
+        if diversity < self.target_diversity:
+            return min(mutation_rate * self.adaptation_factor, self.max_rate)
+
+        return max(mutation_rate / self.adaptation_factor, self.min_rate)
@@ -0,0 +1,155 @@
+import numpy as np
+
+from stopping_criteria import calculate_diversity
+
+
+class OptimisationHistory:
+    """Class to record the progress of an optimisation, one record per epoch. The best, mean and worst route distance,
+    and the diversity of the population, are stored in preallocated numpy arrays, rather than in growing lists.
+
+    Only the best route found so far is kept, as a read-only copy made when the best distance improves, so the
+    population can be changed in place afterwards without corrupting the record, and memory does not grow with the
+    number of epochs.
+
+    For very long runs, a ring buffer keeps just the most recent records: once it is full, each new record overwrites
+    the oldest. The best route and distance, and the first best distance, are always kept.
+    """
+
+    def __init__(self, capacity, ring_buffer=False, record_diversity=True):
+        """Preallocates the history arrays.
+
+        Args:
+            capacity (int): number of records to preallocate. Without a ring buffer, the arrays grow if it is exceeded.
+            ring_buffer (bool): if True, only the most recent capacity records are kept
+            record_diversity (bool): if True, the fraction of distinct routes in the population is recorded
+        """
+
+        self.capacity = max(capacity, 1)
+        self.ring_buffer = ring_buffer
+        self.record_diversity = record_diversity
+        self.number_recorded = 0
+        self._best_distances = np.full(self.capacity, np.nan)
+        self._mean_distances = np.full(self.capacity, np.nan)
+        self._worst_distances = np.full(self.capacity, np.nan)
+        self._diversities = np.full(self.capacity, np.nan)
+        self.first_best_distance = None
+        self.best_distance = np.inf
+        self.best_route = None
+        self.best_epoch = None
+
+    def _grow(self):
+        """Doubles the size of the history arrays, when more records are made than were preallocated.
+
+        Returns:
+            None
+        """
+
+        padding = np.full(self.capacity, np.nan)
+        self._best_distances = np.concatenate([self._best_distances, padding])
+        self._mean_distances = np.concatenate([self._mean_distances, padding])
+        self._worst_distances = np.concatenate([self._worst_distances, padding])
+        self._diversities = np.concatenate([self._diversities, padding])
+        self.capacity *= 2
+
+    def record(self, population, distances):
+        """Records one epoch of the optimisation.
+
+        Args:
+            population (numpy ndarray): 2D array of routes, one per row
+            distances (numpy ndarray): route distance of each individual
+
+        Returns:
+            None
+        """
+
+        if self.ring_buffer:
+            position = self.number_recorded % self.capacity
+        else:
+            if self.number_recorded == self.capacity:
+                self._grow()
+            position = self.number_recorded
+
+        min_idx = int(np.argmin(distances))
+        min_distance = float(distances[min_idx])
+        self._best_distances[position] = min_distance
+        self._mean_distances[position] = distances.mean()
+        self._worst_distances[position] = distances.max()
+        if self.record_diversity:
+            self._diversities[position] = calculate_diversity(population)
+
+        if self.first_best_distance is None:
+            self.first_best_distance = min_distance
+        if min_distance < self.best_distance:
+            self.best_distance = min_distance
+            self.best_route = population[min_idx].copy()
+            self.best_route.flags.writeable = False
+            self.best_epoch = self.number_recorded
+
+        self.number_recorded += 1
+
+    def _chronological(self, values):
+        """Returns the recorded part of a history array, from oldest to newest record.
+
+        Args:
+            values (numpy ndarray): history array
+
+        Returns:
+            values (numpy ndarray): recorded values, from oldest to newest
+        """
+
+        if self.ring_buffer and self.number_recorded > self.capacity:
+            return np.roll(values, -(self.number_recorded % self.capacity))
+
+        return values[:self.number_recorded]
+
+    @property
+    def epochs(self):
+        """Epoch number of each record held, from oldest to newest."""
+        return np.arange(self.number_recorded - len(self.best_distances), self.number_recorded)
+
+    @property
+    def best_distances(self):
+        """Best route distance of each record held, from oldest to newest."""
+        return self._chronological(self._best_distances)
+
+    @property
+    def mean_distances(self):
+        """Mean route distance of each record held, from oldest to newest."""
+        return self._chronological(self._mean_distances)
+
+    @property
+    def worst_distances(self):
+        """Worst route distance of each record held, from oldest to newest."""
+        return self._chronological(self._worst_distances)
+
+    @property
+    def diversities(self):
+        """Population diversity of each record held, from oldest to newest."""
+        return self._chronological(self._diversities)
+
+    def get_latest_record(self):
+        """Returns the most recent record.
+
+        Returns:
+            record (dict): epoch, best, mean and worst distance, and diversity of the most recent record
+        """
+
+        position = (self.number_recorded - 1) % self.capacity
+
+        return {
+            'epoch': self.number_recorded - 1,
+            'best_distance': self._best_distances[position],
+            'mean_distance': self._mean_distances[position],
+            'worst_distance': self._worst_distances[position],
+            'diversity': self._diversities[position],
+        }
+
+    @property
+    def latest_best_distance(self):
+        """Best route distance of the most recent record."""
+        return self._best_distances[(self.number_recorded - 1) % self.capacity]
+
+    @property
+    def latest_diversity(self):
+        """Population diversity of the most recent record."""
+        return self._diversities[(self.number_recorded - 1) % self.capacity]
@@ -0,0 +1,235 @@
+import numpy as np
+
+from ga_operators import swap_mutation_batch
+
+
+def _close_tour(order):
+    """Rotates an order of local room indexes so that it starts at the start room (local index 0), and closes it by
+    returning to the start room. Rotating a closed round does not change its length.
+
+    Args:
+        order (list or numpy ndarray): order in which every room is visited once
+
+    Returns:
+        tour (numpy ndarray): closed tour of local room indexes, starting and ending at the start room
+    """
+
+    order = np.asarray(order)
+    start_position = int(np.flatnonzero(order == 0)[0])
+
+    return np.append(np.roll(order, -start_position), 0)
+
+
+def _find_component(components, room):
+    """Finds the representative room of the component a room belongs to, in a union-find forest, halving the path
+    as it goes.
+
+    Args:
+        components (list): parent of each room in the union-find forest, updated in place
+        room (int): local room index
+
+    Returns:
+        representative (int): representative room of the component
+    """
+
+    while components[room] != room:
+        components[room] = components[components[room]]
+        room = components[room]
+
+    return room
+
+
+def nearest_neighbour_tour(local_matrix, rng):
+    """Builds a tour with the nearest neighbour heuristic: starting from a random room, the nearest unvisited room is
+    always visited next. Starting from a random room, rather than the start room, gives different tours each time.
+
+    Args:
+        local_matrix (numpy ndarray): distance matrix between the rooms of the round
+        rng (numpy Generator): random number generator
+
+    Returns:
+        tour (numpy ndarray): closed tour of local room indexes, starting and ending at the start room
+    """
+
+    number_of_rooms = len(local_matrix)
+    current_room = int(rng.integers(number_of_rooms))
+    unvisited = np.ones(number_of_rooms, dtype=bool)
+    unvisited[current_room] = False
+    order = [current_room]
+
+    for _ in range(number_of_rooms - 1):
+        current_room = int(np.argmin(np.where(unvisited, local_matrix[current_room], np.inf)))
+        unvisited[current_room] = False
+        order.append(current_room)
+
+    return _close_tour(order)
+
+
+def greedy_edge_tour(local_matrix, rng):
+    """Builds a tour with the greedy edge heuristic: edges are added from shortest to longest, skipping any edge that
+    would give a room more than two edges or close a cycle early, until the edges form a single path, which is then
+    closed. Edges of equal length are taken in a random order.
+
+    Args:
+        local_matrix (numpy ndarray): distance matrix between the rooms of the round
+        rng (numpy Generator): random number generator
+
+    Returns:
+        tour (numpy ndarray): closed tour of local room indexes, starting and ending at the start room
+    """
+
+    number_of_rooms = len(local_matrix)
+    if number_of_rooms < 3:
+        return _close_tour(np.arange(number_of_rooms))
+
+    rooms_1, rooms_2 = np.triu_indices(number_of_rooms, 1)
+    edge_lengths = local_matrix[rooms_1, rooms_2]
+    edge_order = np.lexsort((rng.random(len(edge_lengths)), edge_lengths))
+
+    degrees = [0] * number_of_rooms
+    components = list(range(number_of_rooms))
+    adjacency = [[] for _ in range(number_of_rooms)]
+    edges_added = 0
+    for room_1, room_2 in zip(rooms_1[edge_order].tolist(), rooms_2[edge_order].tolist()):
+        if degrees[room_1] == 2 or degrees[room_2] == 2:
+            continue
+        component_1, component_2 = _find_component(components, room_1), _find_component(components, room_2)
+        if component_1 == component_2:
+            continue
+
+        components[component_1] = component_2
+        degrees[room_1] += 1
+        degrees[room_2] += 1
+        adjacency[room_1].append(room_2)
+        adjacency[room_2].append(room_1)
+        edges_added += 1
+        if edges_added == number_of_rooms - 1:
+            break
+
+    # Walk the path from one of its ends
+    previous_room, room = None, degrees.index(1)
+    order = [room]
+    for _ in range(number_of_rooms - 1):
+        next_room = adjacency[room][0] if adjacency[room][0] != previous_room else adjacency[room][1]
+        previous_room, room = room, next_room
+        order.append(room)
+
+    return _close_tour(order)
+
+
+def cheapest_insertion_tour(local_matrix, rng):
+    """Builds a tour with the cheapest insertion heuristic: starting from a round of the start room and a random
+    room, the room that adds the least distance is inserted, at its cheapest position, until every room is in the
+    round. The cost of every remaining room at every position is found at once each step.
+
+    Args:
+        local_matrix (numpy ndarray): distance matrix between the rooms of the round
+        rng (numpy Generator): random number generator
+
+    Returns:
+        tour (numpy ndarray): closed tour of local room indexes, starting and ending at the start room
+    """
+
+    number_of_rooms = len(local_matrix)
+    if number_of_rooms < 3:
+        return _close_tour(np.arange(number_of_rooms))
+
+    tour = [0, int(rng.integers(1, number_of_rooms))]
+    uninserted = np.ones(number_of_rooms, dtype=bool)
+    uninserted[tour] = False
+
+    for _ in range(number_of_rooms - 2):
+        edge_starts = np.array(tour)
+        edge_ends = np.roll(edge_starts, -1)
+        rooms = np.flatnonzero(uninserted)
+        insertion_costs = (local_matrix[edge_starts[:, None], rooms] + local_matrix[rooms, edge_ends[:, None]]
+                           - local_matrix[edge_starts, edge_ends][:, None])
+        edge_idx, room_idx = np.unravel_index(np.argmin(insertion_costs), insertion_costs.shape)
+        tour.insert(edge_idx + 1, int(rooms[room_idx]))
+        uninserted[rooms[room_idx]] = False
+
+    return _close_tour(tour)
+
+
+SEEDING_STRATEGIES = {
+    'nearest_neighbour': nearest_neighbour_tour,
+    'greedy_edge': greedy_edge_tour,
+    'cheapest_insertion': cheapest_insertion_tour,
+}
+
+
+def create_seeded_routes(distance_matrix, route_rooms, seeding_mix, population_size, perturbation_rate, rng):
+    """Creates routes for part of a population from construction heuristics. Each heuristic fills its fraction of the
+    population. The first route from each heuristic is kept as built, and the rest are perturbed with random swaps, so
+    the seeded routes are good without all being the same.
+
+    Args:
+        distance_matrix (numpy ndarray): distance matrix of each room to each other room
+        route_rooms (numpy ndarray): room indexes of the rooms in the round, starting with the start room
+        seeding_mix (dict): fraction of the population seeded by each heuristic, keyed by a name in
+        SEEDING_STRATEGIES, or by a function with the same signature as those above
+        population_size (int): number of individuals in the population
+        perturbation_rate (float): chance of a swap per gene, for the perturbed routes
+        rng (numpy Generator): random number generator
+
+    Returns:
+        seeded_routes (numpy ndarray): 2D array of seeded routes of room indexes, one per row
+    """
+
+    if sum(seeding_mix.values()) > 1:
+        raise ValueError("The seeding mix cannot seed more than the whole population")
+
+    route_rooms = np.asarray(route_rooms)
+    local_matrix = np.asarray(distance_matrix[np.ix_(route_rooms, route_rooms)], dtype=float)
+
+    seeded_tours = [np.empty((0, len(route_rooms) + 1), dtype=int)]
+    for strategy, fraction in seeding_mix.items():
+        seeding_function = SEEDING_STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+        number_of_routes = int(round(fraction * population_size))
+        if number_of_routes == 0:
+            continue
+
+        tours = np.stack([seeding_function(local_matrix, rng) for _ in range(number_of_routes)])
+        swap_mutation_batch(tours[1:], perturbation_rate, rng)
+        seeded_tours.append(tours)
+
+    return route_rooms[np.concatenate(seeded_tours)]
+
+
+def repair_route(previous_route, route_rooms, distance_matrix):
+    """Repairs a route from a previous run into a valid route for a changed round, e.g. to warm start a new run from a
+    previous best route. Rooms no longer in the round are dropped, the order of the remaining rooms is kept (rotated to
+    start at the round's start room), and each new room is inserted at the position that adds the least distance.
+
+    Args:
+        previous_route (numpy ndarray): previous route of room indexes
+        route_rooms (numpy ndarray): room indexes of the rooms in the new round, starting with the start room
+        distance_matrix (numpy ndarray): distance matrix of each room to each other room
+
+    Returns:
+        route (numpy ndarray): route of room indexes visiting every room of the new round once, starting and ending at
+        the start room
+    """
+
+    route_rooms = np.asarray(route_rooms).tolist()
+    start_room = route_rooms[0]
+    kept_rooms = set(route_rooms)
+    order = [room for room in dict.fromkeys(np.asarray(previous_route).tolist()) if room in kept_rooms]
+
+    if start_room in order:
+        start_position = order.index(start_room)
+        order = order[start_position:] + order[:start_position]
+    else:
+        order.insert(0, start_room)
+
+    visited_rooms = set(order)
+    for room in route_rooms:
+        if room in visited_rooms:
+            continue
+        tour = np.array(order + [start_room])
+        insertion_costs = (distance_matrix[tour[:-1], room] + distance_matrix[room, tour[1:]]
+                           - distance_matrix[tour[:-1], tour[1:]])
+        order.insert(int(np.argmin(insertion_costs)) + 1, room)
+        visited_rooms.add(room)
+
+    return np.array(order + [start_room])
@@ -0,0 +1,89 @@
+import time
+import numpy as np
+
+from ga_operators import row_keys
+
+
+def calculate_diversity(population):
+    """Calculates the diversity of a population, as the fraction of its individuals that are distinct routes. Each row
+    is viewed as a single opaque value, so duplicate rows are found with one np.unique.
+
+    Args:
+        population (numpy ndarray): 2D array of routes, one per row
+
+    Returns:
+        diversity (float): number of distinct routes / population size
+    """
+
+    return len(np.unique(row_keys(population))) / len(population)
+
+
+class StoppingCriteria:
+    """Class to decide when a GeneticAlgorithm run should stop before its full number of epochs. Any combination of the
+    criteria below can be set, and the run stops as soon as one of them is met. Criteria left as None are not checked,
+    so StoppingCriteria() keeps the fixed-epoch behaviour.
+
+    * patience: the best distance has not improved for this many epochs
+    * time_budget: this much wall-clock time has passed since the run started, s
+    * target_distance: a route this short or shorter has been found, m
+    * min_diversity: the fraction of distinct routes in the population has collapsed below this value
+    """
+
+    def __init__(self, patience=None, time_budget=None, target_distance=None, min_diversity=None):
+        """Stores the stopping criteria.
+
+        Args:
+            patience (int): number of epochs without improvement before stopping
+            time_budget (float): wall-clock time budget of the run, s
+            target_distance (float): distance at or below which to stop, m
+            min_diversity (float): fraction of distinct routes below which to stop, between 0 and 1
+        """
+
+        self.patience = patience
+        self.time_budget = time_budget
+        self.target_distance = target_distance
+        self.min_diversity = min_diversity
+        self.start_time = None
+        self.best_distance = np.inf
+        self.last_improvement_epoch = 0
+
+    def start(self):
+        """Starts the clock, and resets the improvement tracking, at the start of a run.
+
+        Returns:
+            None
+        """
+
+        self.start_time = time.perf_counter()
+        self.best_distance = np.inf
+        self.last_improvement_epoch = 0
+
+    def check(self, genetic_algorithm):
+        """Checks every criterion against the state of a GeneticAlgorithm after an epoch.
+
+        Args:
+            genetic_algorithm (GeneticAlgorithm): the genetic algorithm being run
+
+        Returns:
+            stop_reason (str): why the run should stop, or None if it should continue
+        """
+
+        min_distance = genetic_algorithm.history.latest_best_distance
+        if min_distance < self.best_distance:
+            self.best_distance = min_distance
+            self.last_improvement_epoch = genetic_algorithm.epochs_run
+
+        if self.target_distance is not None and self.best_distance <= self.target_distance:
+            return f"target distance of {self.target_distance} m reached"
+        if self.patience is not None and genetic_algorithm.epochs_run - self.last_improvement_epoch >= self.patience:
+            return f"no improvement for {self.patience} epochs"
+        if self.time_budget is not None and time.perf_counter() - self.start_time >= self.time_budget:
+            return f"time budget of {self.time_budget} s used"
+        if self.min_diversity is not None:
+            diversity = genetic_algorithm.history.latest_diversity
+            if np.isnan(diversity):
+                diversity = calculate_diversity(genetic_algorithm.population)
+            if diversity < self.min_diversity:
+                return f"population diversity collapsed to {diversity:.3f}"
+
+        return None
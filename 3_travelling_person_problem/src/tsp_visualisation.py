@@ -1,19 +1,33 @@
 import matplotlib.pyplot as plt
 
 
-def visualise_fitness(min_distances):
-    """Creates simple plot showing the optimisation improvement across epochs
+def visualise_fitness(min_distances, mean_distances=None, worst_distances=None, epochs=None):
+    """Creates simple plot showing the optimisation improvement across epochs. If the mean and worst distances of each
+    population are given, the spread of the population is shaded behind the best distance.
 
     Args:
-        min_distances (list): list of the minimum distances travelled (best sequences identified) per epoch
+        min_distances (list or numpy ndarray): minimum distances travelled (best sequences identified) per epoch
+        mean_distances (list or numpy ndarray): mean distance travelled by the population per epoch (optional)
+        worst_distances (list or numpy ndarray): maximum distance travelled by the population per epoch (optional)
+        epochs (numpy ndarray): epoch number of each value, e.g. when only the most recent epochs are kept (optional)
 
     Returns:
         None
     """
 
+    if epochs is None:
+        epochs = range(len(min_distances))
+
     fig, ax = plt.subplots()
     fig.set_size_inches(16, 10)
-    ax.plot(min_distances, c='deepskyblue', linewidth='3')
+    if worst_distances is not None:
+        ax.fill_between(epochs, min_distances, worst_distances, color='deepskyblue', alpha=0.15,
+                        label='Population range')
+    if mean_distances is not None:
+        ax.plot(epochs, mean_distances, c='steelblue', linewidth='1', label='Population mean')
+    ax.plot(epochs, min_distances, c='deepskyblue', linewidth='3', label='Best')
+    if mean_distances is not None or worst_distances is not None:
+        ax.legend()
     plt.ylabel('Distance travelled by nurse, m')
     plt.xlabel('Epoch')
     plt.title("Improvement of distance travelled over epochs")
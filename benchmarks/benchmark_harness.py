@@ -0,0 +1,165 @@
+import json
+import os
+import platform
+import time
+import tracemalloc
+import numpy as np
+
+
+def measure_workload(run, repeats):
+    """Measures the runtime and peak memory of a workload. The runtime is the fastest of several runs, which is the
+    least affected by other processes. Peak memory is measured in a separate run, as tracing every allocation slows
+    the workload down.
+
+    Args:
+        run (function): runs the workload once
+        repeats (int): number of timed runs
+
+    Returns:
+        runtime (float): fastest runtime, s
+        peak_memory (int): peak memory allocated during a run, bytes
+    """
+
+    runtimes = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        run()
+        runtimes.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(runtimes), peak_memory
+
+
+def fit_scaling_exponent(sizes, runtimes):
+    """Fits the exponent k of runtime ~ size^k, by a straight line fit of log runtime against log size.
+
+    Args:
+        sizes (list): building sizes, in number of rooms
+        runtimes (list): runtime at each size, s
+
+    Returns:
+        exponent (float): scaling exponent, or None if there are fewer than two sizes
+    """
+
+    if len(sizes) < 2:
+        return None
+
+    return float(np.polyfit(np.log(sizes), np.log(runtimes), 1)[0])
+
+
+def load_baseline(path):
+    """Loads the stored baseline.
+
+    Args:
+        path (str): path of the baseline json file
+
+    Returns:
+        baseline (dict): the machine the baseline was measured on, the workloads skipped on it, and its results keyed
+        by workload and size, or None if there is no baseline
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r') as handle:
+        return json.load(handle)
+
+
+def save_baseline(results, skipped_workloads, path):
+    """Saves results as the new baseline, with a note of the machine they were measured on, and of the workloads that
+    could not be run on it.
+
+    Args:
+        results (dict): results, keyed by workload and size
+        skipped_workloads (dict): why each skipped workload could not be run, keyed by workload
+        path (str): path of the baseline json file
+
+    Returns:
+        None
+    """
+
+    baseline = {'machine': f"{platform.node()} ({platform.processor() or platform.machine()}), "
+                           f"Python {platform.python_version()}",
+                'skipped_workloads': skipped_workloads,
+                'results': results}
+    with open(path, 'w') as handle:
+        json.dump(baseline, handle, indent=2)
+
+
+def find_regressions(results, baseline, tolerance, min_runtime_change=1e-3, min_memory_change=2 ** 16):
+    """Compares results with the baseline, and finds every workload that is slower, or uses more memory, by more than
+    a tolerance. Small absolute changes are ignored, as they are mostly noise. Workloads run on a different type of
+    network from their baseline are not compared.
+
+    Args:
+        results (dict): results, keyed by workload and size
+        baseline (dict): baseline results, keyed by workload and size
+        tolerance (float): allowed fractional increase, e.g. 0.25 for 25 %
+        min_runtime_change (float): smallest increase in runtime that can be a regression, s
+        min_memory_change (int): smallest increase in peak memory that can be a regression, bytes
+
+    Returns:
+        regressions (list): description of each regression
+    """
+
+    regressions = []
+    for key, result in results.items():
+        baseline_result = baseline.get(key)
+        if baseline_result is None or baseline_result.get('network') != result.get('network'):
+            continue
+
+        for measure, min_change, unit_scale, unit in [('runtime', min_runtime_change, 1e3, 'ms'),
+                                                      ('peak_memory', min_memory_change, 2 ** -20, 'MiB')]:
+            change = result[measure] - baseline_result[measure]
+            if change > min_change and change > tolerance * baseline_result[measure]:
+                regressions.append(f"{key}: {measure} {baseline_result[measure] * unit_scale:.2f} -> "
+                                   f"{result[measure] * unit_scale:.2f} {unit} "
+                                   f"(+{100 * change / baseline_result[measure]:.0f} %)")
+
+    return regressions
+
+
+def find_uncompared_workloads(results, baseline):
+    """Finds the workloads that cannot be compared with the baseline: those in the baseline that are missing from the
+    results, e.g. because a module they need is not installed, and those in the results with no comparable baseline,
+    e.g. because they were skipped when the baseline was saved, or run on a different type of network.
+
+    Args:
+        results (dict): results, keyed by workload and size
+        baseline (dict): baseline results, keyed by workload and size
+
+    Returns:
+        missing_keys (list): workloads and sizes in the baseline that are missing from the results
+        uncovered_keys (list): workloads and sizes in the results with no comparable baseline
+    """
+
+    missing_keys = [key for key in baseline if key not in results]
+    uncovered_keys = [key for key, result in results.items()
+                      if key not in baseline or baseline[key].get('network') != result.get('network')]
+
+    return missing_keys, uncovered_keys
+
+
+def print_results_table(results, baseline):
+    """Prints the runtime and peak memory of every workload at every size, with the change from the baseline.
+
+    Args:
+        results (dict): results, keyed by workload and size
+        baseline (dict): baseline results, keyed by workload and size (optional)
+
+    Returns:
+        None
+    """
+
+    print(f"{'workload':<34}{'network':>10}{'runtime, ms':>14}{'change':>10}{'peak, MiB':>12}{'change':>10}")
+    for key, result in results.items():
+        baseline_result = (baseline or {}).get(key)
+        comparable = baseline_result is not None and baseline_result.get('network') == result.get('network')
+        changes = [f"{100 * (result[measure] / baseline_result[measure] - 1):+.0f} %"
+                   if comparable and baseline_result[measure] > 0 else '-' for measure in ['runtime', 'peak_memory']]
+        print(f"{key:<34}{result.get('network') or '-':>10}{1e3 * result['runtime']:>14.2f}{changes[0]:>10}"
+              f"{result['peak_memory'] / 2 ** 20:>12.2f}{changes[1]:>10}")
@@ -0,0 +1,359 @@
+import importlib.util
+import os
+import sys
+from functools import cached_property
+import networkx as nx
+import numpy as np
+
+# The benchmarks import the modules of all three apps
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for app_dir in ['1_building_layouts', '2_building_navigation', '3_travelling_person_problem']:
+    sys.path.insert(0, os.path.join(repository_dir, app_dir, 'src'))
+
+from synthetic_building import create_synthetic_building
+from navigation import find_shortest_path
+from ga_mappings import create_distance_matrix, create_mapping
+from genetic_algorithm import GeneticAlgorithm
+
+# Modules needed to create the straight skeletons, and to import the app 1 network modules
+GEOMETRY_MODULES = ('skgeom', 'descartes')
+
+
+def find_missing_modules(module_names):
+    """Finds which of a list of modules cannot be imported.
+
+    Args:
+        module_names (tuple): names of modules
+
+    Returns:
+        missing_modules (list): names of the modules that are not installed
+    """
+
+    return [module_name for module_name in module_names if importlib.util.find_spec(module_name) is None]
+
+
+def _create_doorway_network(polygon_dict, doorway_location_dict, doorway_info_dict):
+    """Creates a simple network of a building from its polygons and doorways alone, used when the straight skeletons
+    cannot be created. Each room has a node at a point inside it, and each doorway a node at its midpoint, joined to
+    the nodes of the two rooms it connects. Edge weights are Euclidean distances, as in the final network of app 1.
+
+    Args:
+        polygon_dict (dict): dictionary of room polygons
+        doorway_location_dict (dict): doorway coordinates (two points) for each room
+        doorway_info_dict (dict): the room on the other side of the doorway of each room
+
+    Returns:
+        G (networkx graph object): network of building
+    """
+
+    G = nx.Graph()
+    for room_name, polygon in polygon_dict.items():
+        point = polygon.representative_point()
+        G.add_node(f"{room_name} n1", parent_room=room_name, coords=(round(point.x, 3), round(point.y, 3)))
+
+    for room_name, doorway_coords in doorway_location_dict.items():
+        doorway_node = f"{room_name} n2"
+        coords = tuple(round(0.5 * (doorway_coords[0][idx] + doorway_coords[1][idx]), 3) for idx in range(2))
+        G.add_node(doorway_node, parent_room=room_name, coords=coords)
+        for room_node in [f"{room_name} n1", f"{doorway_info_dict[room_name]} n1"]:
+            room_coords = G.nodes[room_node]['coords']
+            G.add_edge(doorway_node, room_node, weight=float(np.hypot(coords[0] - room_coords[0],
+                                                                      coords[1] - room_coords[1])))
+
+    return G
+
+
+class BenchmarkBuilding:
+    """Class holding a synthetic building of a given size, and the output of each stage of the apps for it, so each
+    workload can be run on the output of the stage before it. Every stage is calculated the first time it is needed,
+    outside the timed workloads.
+    """
+
+    def __init__(self, number_of_rooms, seed=None):
+        """Generates the synthetic building.
+
+        Args:
+            number_of_rooms (int): number of rooms in the building, excluding the corridors
+            seed (int): seed of the building generator, and of the random choices made by the workloads
+        """
+
+        self.number_of_rooms = number_of_rooms
+        self.seed = seed
+        self.polygon_dict, self.doorway_location_dict, self.doorway_info_dict = \
+            create_synthetic_building(number_of_rooms, seed=seed)
+        self.geometry_available = not find_missing_modules(GEOMETRY_MODULES)
+
+    @cached_property
+    def skeleton_dict(self):
+        """Straight skeleton of each room."""
+        from geometry_processing import _create_clinic_skeletons
+        return _create_clinic_skeletons(self.polygon_dict)
+
+    @cached_property
+    def room_segment_dict(self):
+        """Line segments of the straight skeleton of each room."""
+        from geometry_processing import _create_skeleton_line_dict
+        return _create_skeleton_line_dict(self.skeleton_dict)
+
+    @cached_property
+    def cut_segment_dicts(self):
+        """Room line segments cut at the doorways, and the connecting segment of each doorway."""
+        from geometry_processing import _find_doorway_intersections
+        return _find_doorway_intersections(dict(self.room_segment_dict), self.doorway_location_dict,
+                                           self.doorway_info_dict)
+
+    @cached_property
+    def complex_network(self):
+        """Untrimmed network of the building."""
+        from graph_generation import create_building_network
+        return create_building_network(*self.cut_segment_dicts)
+
+    @cached_property
+    def trimmed_networks(self):
+        """Network of the building after each stage of the trim sequence."""
+        from graph_simplification import _trim_graph, _remove_close_order_1_nodes, _contract_graph
+        stage_1_G, _ = _trim_graph(self.complex_network)
+        stage_2_G, number_nodes_removed = _remove_close_order_1_nodes(stage_1_G, threshold=1.5)
+        while number_nodes_removed > 0:
+            stage_2_G, number_nodes_removed = _remove_close_order_1_nodes(stage_2_G, threshold=1.5)
+        stage_3_G, _ = _contract_graph(stage_2_G, threshold=0.5)
+
+        return stage_1_G, stage_2_G, stage_3_G
+
+    @cached_property
+    def network_type(self):
+        """Network the navigation and travelling person workloads run on: the final network of app 1 if the straight
+        skeletons can be created, otherwise the simple doorway network."""
+        return 'skeleton' if self.geometry_available else 'doorway'
+
+    @cached_property
+    def final_network(self):
+        """Final network of the building, with Euclidean edge weights."""
+        if not self.geometry_available:
+            return _create_doorway_network(self.polygon_dict, self.doorway_location_dict, self.doorway_info_dict)
+
+        from graph_simplification import final_graph_processing
+        return final_graph_processing(self.trimmed_networks[2].copy())
+
+    @cached_property
+    def distance_matrix(self):
+        """Distance matrix between every room, and the list of rooms in its order."""
+        return create_distance_matrix(self.final_network)
+
+
+def _prepare_skeleton_creation(building):
+    """Prepares the workload: creating the straight skeleton of every room.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from geometry_processing import _create_clinic_skeletons
+    return lambda: _create_clinic_skeletons(building.polygon_dict)
+
+
+def _prepare_doorway_intersection(building):
+    """Prepares the workload: cutting the skeletons of the two rooms either side of every doorway.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from geometry_processing import _find_doorway_intersections
+    room_segment_dict = building.room_segment_dict
+    return lambda: _find_doorway_intersections(dict(room_segment_dict), building.doorway_location_dict,
+                                               building.doorway_info_dict)
+
+
+def _prepare_create_network_nodes(building):
+    """Prepares the workload: creating the nodes of every room from its cut line segments.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from graph_generation import _create_network_nodes
+    room_segment_dict = building.cut_segment_dicts[0]
+
+    def run():
+        for room_name, segment_list in room_segment_dict.items():
+            _create_network_nodes(room_name, segment_list)
+
+    return run
+
+
+def _prepare_create_building_network(building):
+    """Prepares the workload: creating the complex network of the building from the cut line segments.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from graph_generation import create_building_network
+    room_segment_dict, connecting_segment_dict = building.cut_segment_dicts
+    return lambda: create_building_network(room_segment_dict, connecting_segment_dict)
+
+
+def _prepare_trim_stage_1(building):
+    """Prepares the workload: stage 1 of the trim sequence: removing every order 1 node.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from graph_simplification import _trim_graph
+    complex_G = building.complex_network
+    return lambda: _trim_graph(complex_G)
+
+
+def _prepare_trim_stage_2(building):
+    """Prepares the workload: stage 2 of the trim sequence: removing close order 1 nodes until none are left.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from graph_simplification import _remove_close_order_1_nodes
+    stage_1_G = building.trimmed_networks[0]
+
+    def run():
+        trimmed_G, number_nodes_removed = _remove_close_order_1_nodes(stage_1_G, threshold=1.5)
+        while number_nodes_removed > 0:
+            trimmed_G, number_nodes_removed = _remove_close_order_1_nodes(trimmed_G, threshold=1.5)
+
+    return run
+
+
+def _prepare_trim_stage_3(building):
+    """Prepares the workload: stage 3 of the trim sequence: contracting close node pairs until none are left.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    from graph_simplification import _contract_graph
+    stage_2_G = building.trimmed_networks[1]
+    return lambda: _contract_graph(stage_2_G, threshold=0.5)
+
+
+def _prepare_find_shortest_path(building, number_of_queries=100):
+    """Prepares the workload: a batch of shortest path queries between random pairs of nodes.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+        number_of_queries (int): number of shortest path queries per run
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    G = building.final_network
+    rng = np.random.default_rng(building.seed)
+    nodes = list(G.nodes)
+    node_pairs = [tuple(nodes[idx] for idx in rng.choice(len(nodes), 2, replace=False))
+                  for _ in range(number_of_queries)]
+
+    def run():
+        for node_1, node_2 in node_pairs:
+            find_shortest_path(G, node_1, node_2)
+
+    return run
+
+
+def _prepare_create_distance_matrix(building):
+    """Prepares the workload: distance matrix between every room of the building.
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    G = building.final_network
+    return lambda: create_distance_matrix(G)
+
+
+def _prepare_ga_epoch(building, max_route_length=200, population_size=200, epochs_per_run=10):
+    """Prepares the workload: a few epochs of the genetic algorithm, visiting every room (up to a maximum route length).
+
+    Args:
+        building (BenchmarkBuilding): building the workload is run on
+        max_route_length (int): largest number of rooms to visit, besides the start room
+        population_size (int): number of individuals in the population
+        epochs_per_run (int): number of epochs per run of the workload
+
+    Returns:
+        run (function): runs the workload once
+    """
+
+    distance_matrix, room_list = building.distance_matrix
+    map_dict = create_mapping(room_list)
+    route_length = min(building.number_of_rooms, max_route_length) + 1
+    genetic_algorithm = GeneticAlgorithm(route_length, 10 ** 9, population_size, population_size // 8, 0.01, map_dict,
+                                         seed=building.seed, history_size=1000)
+    epochs = genetic_algorithm.iterate(distance_matrix, route_length, map_dict)
+    next(epochs)
+
+    def run():
+        for _ in range(epochs_per_run):
+            next(epochs)
+
+    return run
+
+
+# Each workload: the function that prepares it for a building (returning a callable that runs it once), the modules
+# it needs, and whether its result depends on the network type
+WORKLOADS = {
+    'skeleton_creation': (_prepare_skeleton_creation, GEOMETRY_MODULES, False),
+    'doorway_intersection': (_prepare_doorway_intersection, GEOMETRY_MODULES, False),
+    'create_network_nodes': (_prepare_create_network_nodes, GEOMETRY_MODULES, False),
+    'create_building_network': (_prepare_create_building_network, GEOMETRY_MODULES, False),
+    'trim_stage_1': (_prepare_trim_stage_1, GEOMETRY_MODULES, False),
+    'trim_stage_2': (_prepare_trim_stage_2, GEOMETRY_MODULES, False),
+    'trim_stage_3': (_prepare_trim_stage_3, GEOMETRY_MODULES, False),
+    'find_shortest_path': (_prepare_find_shortest_path, (), True),
+    'create_distance_matrix': (_prepare_create_distance_matrix, (), True),
+    'ga_epoch': (_prepare_ga_epoch, (), True),
+}
+
+
+def prepare_workload(workload_name, building):
+    """Prepares a workload to be run on a building, unless a module it needs is not installed.
+
+    Args:
+        workload_name (str): name of the workload, a key of WORKLOADS
+        building (BenchmarkBuilding): building the workload is run on
+
+    Returns:
+        run (function): runs the workload once, or None if it cannot be run
+        skip_reason (str): why the workload cannot be run, or None
+    """
+
+    prepare, module_names, _ = WORKLOADS[workload_name]
+    missing_modules = find_missing_modules(module_names)
+    if missing_modules:
+        return None, f"{', '.join(missing_modules)} not installed"
+
+    return prepare(building), None
@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+
+from benchmark_workloads import BenchmarkBuilding, WORKLOADS, prepare_workload
+from benchmark_harness import measure_workload, fit_scaling_exponent, load_baseline, save_baseline, \
+    find_regressions, find_uncompared_workloads, print_results_table
+
+
+def main(update_baseline_bool=False):
+    rseed = 40
+
+    # Define benchmark: building sizes (number of rooms), and the number of timed runs of each workload
+    building_sizes = [25, 100, 400]
+    repeats = 3
+
+    # Results are compared with the stored baseline, and flagged as regressions if slower or larger by the tolerance.
+    # The script exits with an error on a regression, if there is no baseline, or if a workload in the baseline is not
+    # run. With update_baseline_bool (--update-baseline on the command line), the results are saved as the baseline.
+    baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+    tolerance = 0.25
+
+    results, skipped_workloads, scaling_exponents = {}, {}, {}
+    buildings = [BenchmarkBuilding(number_of_rooms, seed=rseed) for number_of_rooms in building_sizes]
+    for workload_name, (_, _, network_dependent) in WORKLOADS.items():
+        runtimes = []
+        for building in buildings:
+            run, skip_reason = prepare_workload(workload_name, building)
+            if run is None:
+                skipped_workloads[workload_name] = skip_reason
+                break
+
+            runtime, peak_memory = measure_workload(run, repeats)
+            runtimes.append(runtime)
+            results[f"{workload_name}[{building.number_of_rooms}]"] = {
+                'runtime': runtime,
+                'peak_memory': peak_memory,
+                'network': building.network_type if network_dependent else None,
+            }
+            print(f"{workload_name} ({building.number_of_rooms} rooms): {1e3 * runtime:.2f} ms")
+
+        if len(runtimes) == len(buildings):
+            scaling_exponents[workload_name] = fit_scaling_exponent(building_sizes, runtimes)
+
+    baseline = None if update_baseline_bool else load_baseline(baseline_path)
+    print()
+    print_results_table(results, baseline and baseline['results'])
+
+    print()
+    for workload_name, exponent in scaling_exponents.items():
+        if exponent is not None:
+            print(f"{workload_name}: runtime ~ rooms^{exponent:.2f}")
+    for workload_name, skip_reason in skipped_workloads.items():
+        print(f"{workload_name}: skipped ({skip_reason})")
+
+    if update_baseline_bool:
+        save_baseline(results, skipped_workloads, baseline_path)
+        print(f"\nBaseline saved to {baseline_path}")
+        return
+
+    if baseline is None:
+        print(f"\nNo baseline at {baseline_path}: run with --update-baseline to save one")
+        sys.exit(1)
+
+    print(f"\nBaseline measured on {baseline['machine']}")
+    missing_keys, uncovered_keys = find_uncompared_workloads(results, baseline['results'])
+    if uncovered_keys:
+        print(f"Not compared, as there is no baseline on the same network: {', '.join(uncovered_keys)}")
+
+    regressions = find_regressions(results, baseline['results'], tolerance)
+    if regressions:
+        print(f"\nRegressions against the baseline (tolerance {100 * tolerance:.0f} %):")
+        for regression in regressions:
+            print(f"  {regression}")
+    if missing_keys:
+        print(f"\nIn the baseline but not run: {', '.join(missing_keys)}")
+    if regressions or missing_keys:
+        sys.exit(1)
+
+    print(f"\nNo regressions against the baseline (tolerance {100 * tolerance:.0f} %)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of the three apps against a baseline.")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="save the results as the new baseline instead of comparing with it")
+    main(update_baseline_bool=parser.parse_args().update_baseline)